@@ -42,4 +42,10 @@ setup(
     packages=find_packages(where='src'),
     python_requires='>=3.6, <4',
     install_requires=['PyYAML', 'Jinja2'],
+    entry_points={
+        'console_scripts': ['pyvcontrold=vcontrold.cli:main'],
+    },
+    extras_require={
+        'numpy': ['numpy'],
+    },
 )
@@ -0,0 +1,3 @@
+from ._vcontrold_transport import vcdTransport, vcdTcpTransport, vcdUnixTransport, vcdMemoryTransport
+
+__all__ = ['vcdTransport', 'vcdTcpTransport', 'vcdUnixTransport', 'vcdMemoryTransport']
@@ -0,0 +1,120 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _vcdBreakerState:
+    """The circuit breaker state of a single command."""
+    __slots__ = ('state', 'failures', 'opened', 'retry_at')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.retry_at = 0.0
+
+
+class vcdCircuitBreaker:
+    """Circuit breakers for the commands, which fail permanently, e.g. with ``NOT OK`` or ``command unknown``.
+
+    A command starts ``closed``. After ``failure_threshold`` consecutive failures its breaker opens and the
+    command is skipped. Once the backoff expired, the breaker is ``half_open`` and the next read re-probes the
+    command: a success closes the breaker, a failure opens it again with twice the backoff, up to ``max_backoff``.
+
+    The state is kept in memory only, so the configuration file is never modified.
+
+    Args:
+        failure_threshold (int): Consecutive failures, which open the breaker. Defaults to 3.
+        backoff (float): Seconds, until an open breaker is re-probed the first time. Defaults to 60.
+        max_backoff (float): Max seconds between two re-probes. Defaults to 3600.
+    """
+
+    def __init__(self, failure_threshold: int = 3, backoff: float = 60.0, max_backoff: float = 3600.0):
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._commands = {}
+
+    def allow(self, command: str) -> bool:
+        """Returns whether a command may be executed.
+
+        An open breaker, whose backoff expired, becomes ``half_open``, so the command is re-probed.
+
+        Args:
+            command (str): Name of the command.
+
+        Returns:
+            bool: ``False``, if the breaker of the command is open.
+        """
+        breaker = self._commands.get(command)
+        if breaker is None or breaker.state != OPEN:
+            return True
+
+        with self._lock:
+            if breaker.state == OPEN and time.monotonic() >= breaker.retry_at:
+                breaker.state = HALF_OPEN
+            return breaker.state != OPEN
+
+    def record_success(self, command: str):
+        """Closes the breaker of a command."""
+        if command not in self._commands:
+            return
+
+        with self._lock:
+            self._commands.pop(command, None)
+
+    def record_failure(self, command: str) -> str:
+        """Counts a failure of a command.
+
+        Args:
+            command (str): Name of the command.
+
+        Returns:
+            str: The new state of the breaker.
+        """
+        with self._lock:
+            breaker = self._commands.get(command)
+            if breaker is None:
+                breaker = self._commands[command] = _vcdBreakerState()
+
+            breaker.failures += 1
+            if breaker.state == HALF_OPEN or breaker.failures >= self.failure_threshold:
+                breaker.opened += 1
+                breaker.state = OPEN
+                breaker.retry_at = time.monotonic() + min(self.max_backoff, self.backoff * 2 ** (breaker.opened - 1))
+
+            return breaker.state
+
+    def state(self, command: str) -> str:
+        """Returns the state of the breaker of a command: ``closed``, ``open`` or ``half_open``."""
+        breaker = self._commands.get(command)
+        return CLOSED if breaker is None else breaker.state
+
+    def states(self) -> dict:
+        """Returns the commands, whose breaker isn't closed, with their state and the seconds until the next re-probe.
+
+        Returns:
+            dict: Dict of dicts with the items ``state``, ``failures`` and ``retry_in``.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                command: dict(
+                    state=breaker.state,
+                    failures=breaker.failures,
+                    retry_in=round(max(0.0, breaker.retry_at - now), 3) if breaker.state == OPEN else 0.0
+                )
+                for command, breaker in self._commands.items() if breaker.state != CLOSED
+            }
+
+    def reset(self, command: str = None):
+        """Closes the breaker of a command, or of all commands, if no command is given."""
+        with self._lock:
+            if command is None:
+                self._commands.clear()
+            else:
+                self._commands.pop(command, None)
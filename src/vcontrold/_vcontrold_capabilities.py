@@ -0,0 +1,88 @@
+import os
+import time
+import yaml
+
+from typing import Optional
+
+from ._vcontrold_files import atomic_write
+
+
+class vcdCapabilities:
+    """Cache of the commands, which are supported by a specific heating control system.
+
+    The cache is created by :py:meth:`vcontrold.probe_capabilities` and stored next to the configuration file as
+    ``vcontrold_capabilities_<device_id>.yml``.
+
+    Args:
+        file (str): Path to the cache file.
+        device_id (int): The device ID of the heating control system.
+    """
+
+    def __init__(self, file: str, device_id: int):
+        self.file = file
+        self.device_id = device_id
+        self.probed_at = None
+        self.commands = {}
+
+    @classmethod
+    def for_config(cls, config_file: str, device_id: int) -> 'vcdCapabilities':
+        """Loads the cache of a device, which belongs to a configuration file.
+
+        Args:
+            config_file (str): Path to the configuration file.
+            device_id (int): The device ID of the heating control system.
+
+        Returns:
+            vcdCapabilities: The cache. It is empty, if the device wasn't probed yet.
+        """
+        config_dir = os.path.dirname(os.path.abspath(config_file))
+        capabilities = cls(os.path.join(config_dir, f"vcontrold_capabilities_{device_id}.yml"), device_id)
+        capabilities.load()
+        return capabilities
+
+    @property
+    def probed(self) -> bool:
+        """:obj:`bool`: Whether the device was probed."""
+        return self.probed_at is not None
+
+    def supported(self, command: str) -> Optional[bool]:
+        """Returns whether a command is supported.
+
+        Args:
+            command (str): Name of the command.
+
+        Returns:
+            bool: ``None``, if the command wasn't probed.
+        """
+        capability = self.commands.get(command)
+        return None if capability is None else capability['supported']
+
+    def latencies(self) -> dict:
+        """:obj:`dict`: The measured latency in seconds of each supported command."""
+        return {
+            command: capability['latency'] for command, capability in self.commands.items()
+            if capability['supported'] is True and capability.get('latency') is not None
+        }
+
+    def record(self, command: str, supported: bool, latency: float):
+        """Records the probe result of a command."""
+        self.commands[command] = dict(supported=supported, latency=round(latency, 3))
+
+    def load(self):
+        """Reads the cache file, if it exists."""
+        try:
+            with open(self.file, "r") as cache:
+                data = yaml.safe_load(cache) or {}
+        except FileNotFoundError:
+            return
+
+        self.probed_at = data.get('probed_at')
+        self.commands = data.get('commands') or {}
+
+    def save(self):
+        """Writes the cache file atomically."""
+        self.probed_at = time.time()
+        data = dict(device_id=self.device_id, probed_at=self.probed_at, commands=self.commands)
+
+        with atomic_write(self.file) as outfile:
+            yaml.safe_dump(data, outfile, default_flow_style=False)
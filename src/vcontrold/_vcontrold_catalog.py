@@ -0,0 +1,303 @@
+import datetime
+import os
+import threading
+
+from ._vcontrold_groups import compile_expression
+
+# Priority of a command, if no ``priority`` is defined for it in the configuration file
+DEFAULT_COMMAND_PRIORITY = 1
+
+
+def _parse_error(value: str, switch_as_bool: bool, use_fahrenheit: bool):
+    error = value.split(" ", 1)
+    error_date = error[0]
+    error_msg = error[1]
+    dt = datetime.datetime.strptime(error_date, "%Y-%m-%dT%H:%M:%S%z")
+
+    return dict(
+        parsed={'date': dt.strftime('%Y-%m-%d'), 'time': dt.strftime('%H:%M:%S'), 'errorMessage': error_msg},
+        original=value
+    ), None
+
+
+def _parse_none(value: str, switch_as_bool: bool, use_fahrenheit: bool):
+    return value, None
+
+
+def _parse_float(unit: str):
+    """Returns a parser for numeric values, which are returned with ``unit``."""
+    def parse(value: str, switch_as_bool: bool, use_fahrenheit: bool):
+        return round(float(value), 2), unit
+
+    return parse
+
+
+def _parse_switch(value: str, switch_as_bool: bool, use_fahrenheit: bool):
+    if switch_as_bool is True:
+        return True if int(value) == 1 else False, "bool"
+    else:
+        return "on" if int(value) == 1 else "off", "bool"
+
+
+def _parse_temperature(value: str, switch_as_bool: bool, use_fahrenheit: bool):
+    value = value.replace("Grad Celsius", "").strip()
+
+    if use_fahrenheit is True:
+        value = float(value)
+        value = (value * 1.8) + 32
+        value = round(float(value), 2)
+        unit = "F"
+    else:
+        value = round(float(value), 2)
+        unit = "C"
+
+    return value, unit
+
+
+def _parse_text(value: str, switch_as_bool: bool, use_fahrenheit: bool):
+    return value, "str"
+
+
+def _parse_time(value: str, switch_as_bool: bool, use_fahrenheit: bool):
+    dt = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+    return dt.strftime('%Y-%m-%d - %H:%M:%S'), "datetime"
+
+
+def _parse_timer(value: str, switch_as_bool: bool, use_fahrenheit: bool):
+    timetable = value.split("\n")
+    timetable_entries_sanitized = []
+    for time_entry in timetable:
+        # Remove leading and trailing whitespaces
+        time_entry = time_entry.strip()
+        # Remote multiple whitespaces within the string
+        time_entry = " ".join(time_entry.split())
+        # Split by remaining white - results in on and off entry
+        time_entry = time_entry.split(" ")
+        # Split at first colon to get index
+        time_entry_a = time_entry[0].split(":", 1)
+        time_entry_index = time_entry_a[0]
+        # Split again at first colon and use index 1, to get the actual value
+        # Example: "An:05:00" -> time_entry_a[1].split(":", 1)[1] -> "05:00"
+        time_entry_on = time_entry_a[1].split(":", 1)[1]
+        time_entry_off = time_entry[1].split(":", 1)[1]
+
+        timetable_entries_sanitized.append({
+            'index': time_entry_index,
+            'on': time_entry_on if time_entry_on != "--" else None,
+            'off': time_entry_off if time_entry_off != "--" else None
+        })
+    # return ';'.join(timetable_entries_sanitized)
+    return dict(parsed=timetable_entries_sanitized, original=timetable), "timetable"
+
+
+# Parsers per configured unit. Each parser returns a tuple of the sanitized value and the unit of measurement.
+PARSERS = {
+    'error': _parse_error,
+    'hours': _parse_float("hours"),
+    'none': _parse_none,
+    'number': _parse_float("number"),
+    'percent': _parse_float("%"),
+    'power': _parse_float("W"),
+    'shift': _parse_float("shift"),
+    'slope': _parse_float("slope"),
+    'switch': _parse_switch,
+    'temperature': _parse_temperature,
+    'text': _parse_text,
+    'time': _parse_time,
+    'timer': _parse_timer,
+}
+
+
+class vcdCommand:
+    """A single command of the configuration file, compiled for fast access.
+
+    Args:
+        name (str): Name of the command.
+        params (dict): Parameters of the command in the configuration file.
+    """
+    __slots__ = ('name', 'unit', 'parser', 'groups', 'devices', 'status', 'description', 'priority')
+
+    def __init__(self, name: str, params: dict):
+        self.name = name
+        self.unit = params.get('unit')
+        self.parser = PARSERS.get(str(self.unit).lower(), _parse_none)
+        self.groups = frozenset(group for group in (params.get('groups') or []) if type(group) == str)
+        self.devices = frozenset(params.get('devices') or [])
+        self.status = params.get('status')
+        self.description = params.get('description')
+        self.priority = params.get('priority', DEFAULT_COMMAND_PRIORITY)
+
+    @property
+    def enabled(self) -> bool:
+        """:obj:`bool`: Whether the command is enabled."""
+        return self.status == "enabled"
+
+    def _fields(self) -> tuple:
+        """Returns the compiled fields, to detect whether the parameters of the command changed."""
+        return self.name, self.unit, self.groups, self.devices, self.status, self.description, self.priority
+
+
+class vcdCatalog:
+    """The commands of the configuration file, compiled to :py:class:`vcdCommand` records.
+
+    If a ``device_id`` is given, only the commands of that device are compiled. The commands of a device are
+    taken from its profile in the section ``device_profiles`` of the configuration file, if it exists::
+
+        device_profiles:
+          2094:
+            commands: all
+            overrides:
+              getTempA:
+                unit: temperature
+                priority: 5
+
+    ``commands`` is either ``all`` or a list of command names. ``overrides`` replaces parameters of single
+    commands for this device. Without a profile, the commands, which list the device ID in ``devices``, are used.
+
+    Each command is indexed by its position, so groups and group expressions are resolved to bitsets over the
+    commands, see :py:meth:`mask`.
+
+    Args:
+        config (dict): The configuration, read from the configuration file.
+        device_id (int): The device ID of the heating control system. Defaults to ``None`` (no commands, as the
+            device isn't identified).
+        previous (vcdCatalog): Catalog of a previous version of the configuration. Its records of the commands,
+            whose parameters didn't change, are reused. Defaults to ``None``.
+    """
+    __slots__ = ('commands', 'groups', 'units', 'device_id', 'names', 'positions', 'group_masks', 'all_mask', '_masks',
+                 '_lock')
+
+    def __init__(self, config: dict, device_id: int = None, previous: 'vcdCatalog' = None):
+        self.device_id = device_id
+        previous_commands = previous.commands if previous is not None else {}
+        self.commands = {}
+        for name, params in self._device_commands(config, device_id):
+            command = vcdCommand(name, params)
+            unchanged = previous_commands.get(name)
+            if unchanged is not None and unchanged._fields() == command._fields():
+                command = unchanged
+            self.commands[name] = command
+        self.groups = sorted(frozenset().union(*(command.groups for command in self.commands.values())))
+        self.units = sorted(set(command.unit for command in self.commands.values() if type(command.unit) == str))
+
+        self.names = tuple(self.commands)
+        self.positions = {name: index for index, name in enumerate(self.names)}
+        self.all_mask = (1 << len(self.names)) - 1
+        self.group_masks = dict.fromkeys(self.groups, 0)
+        for index, command in enumerate(self.commands.values()):
+            for group in command.groups:
+                self.group_masks[group] |= 1 << index
+        self._masks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _device_commands(config: dict, device_id: int):
+        """Yields the names and parameters of the commands of a device, with the overrides of its profile applied."""
+        commands = config['vcontrold_commands']['get']
+        if device_id is None:
+            # The device wasn't identified, so no command is known to be available
+            return
+
+        profiles = config.get('device_profiles') or {}
+        profile = profiles.get(device_id, profiles.get(str(device_id)))
+        if profile is None:
+            for name, params in commands.items():
+                if device_id in (params.get('devices') or []):
+                    yield name, params
+            return
+
+        names = profile.get('commands', 'all')
+        overrides = profile.get('overrides') or {}
+        for name in (commands if names == 'all' else names):
+            if name not in commands:
+                continue
+            params = commands[name]
+            if name in overrides:
+                params = dict(params, **overrides[name])
+            yield name, params
+
+    def mask(self, expression: str) -> int:
+        """Returns the bitset of the commands, which match a group expression.
+
+        Compiled expressions are cached.
+
+        Args:
+            expression (str): A group name or group expression, see :py:func:`compile_expression`.
+
+        Returns:
+            int: Bit ``i`` is set, if the command ``names[i]`` matches.
+
+        Raises:
+            ValueError: If the expression is invalid or refers to an unknown group.
+        """
+        mask = self._masks.get(expression)
+        if mask is None:
+            mask = compile_expression(expression, self.group_masks, self.all_mask)
+            with self._lock:
+                self._masks[expression] = mask
+
+        return mask
+
+    def select(self, mask: int) -> list:
+        """Returns the names of the commands in a bitset, in the order of the configuration file."""
+        names = self.names
+        selected = []
+        while mask:
+            lowest = mask & -mask
+            selected.append(names[lowest.bit_length() - 1])
+            mask ^= lowest
+
+        return selected
+
+    def __getitem__(self, name: str) -> vcdCommand:
+        return self.commands[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.commands
+
+    def __iter__(self):
+        return iter(self.commands.values())
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+
+# Catalogs per configuration file, shared by all instances in the process
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def load_catalog(config_file: str, config: dict, device_id: int = None, previous: vcdCatalog = None) -> vcdCatalog:
+    """Returns the catalog of a configuration file.
+
+    The catalog is compiled once per process and device and shared between all instances, which load the same
+    configuration file, as long as the file isn't modified. Without ``device_id``, the catalog is empty and isn't
+    shared.
+
+    Args:
+        config_file (str): Path to the configuration file.
+        config (dict): The configuration, read from ``config_file``.
+        device_id (int): Only compile the commands of this device. Defaults to ``None`` (no commands).
+        previous (vcdCatalog): Catalog, whose unchanged commands are reused. Defaults to ``None``.
+
+    Returns:
+        vcdCatalog: The compiled commands.
+    """
+    if device_id is None:
+        return vcdCatalog(config, device_id, previous)
+
+    path = os.path.realpath(config_file)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        # The configuration file couldn't be created, so the catalog can't be shared
+        return vcdCatalog(config, device_id, previous)
+
+    with _catalogs_lock:
+        cached = _catalogs.get((path, device_id))
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        catalog = vcdCatalog(config, device_id, previous)
+        _catalogs[(path, device_id)] = (mtime, catalog)
+
+    return catalog
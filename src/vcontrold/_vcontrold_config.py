@@ -1,8 +1,11 @@
 import os
 import yaml
 import pathlib
+import threading
 from jinja2 import Environment, BaseLoader
 
+from ._vcontrold_files import atomic_write
+
 VCONTROLD_CONFIG_DEFAULT = """
 vcontrold_commands:
   get:
@@ -786,9 +789,125 @@ vcontrold_commands:
 
 
 class vcdConfig():
-    def __init__(self, file: str):
+    """Reads and writes the configuration file.
+
+    Changes of the configuration are made with :py:meth:`update_command`, or have to be signaled with
+    :py:meth:`mark_dirty`. The configuration is only written,
+    if it was changed, and not before ``debounce`` seconds passed without further changes. Writes are atomic, so
+    the configuration file is never left in a partially written state.
+
+    Changes of the configuration file by others are detected by :py:meth:`changed`, which only compares the
+    modification time, size and inode of the file, and applied by :py:meth:`reload`.
+
+    Args:
+        file (str): Path to the configuration file.
+        debounce (float): Seconds to wait for further changes, before the configuration is written. Defaults to 5.
+    """
+
+    def __init__(self, file: str, debounce: float = 5.0):
         self.config_file = file
         self.config = self._read_config()
+        self._stat = self._file_stat()
+        self.debounce = debounce
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def dirty(self) -> bool:
+        """:obj:`bool`: Whether the configuration was changed, since it was read or written."""
+        return self._dirty
+
+    def mark_dirty(self):
+        """Signals a changed configuration and schedules a debounced write."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def update_command(self, name: str, params: dict):
+        """Changes parameters of a command and schedules a debounced write.
+
+        Args:
+            name (str): Name of the command.
+            params (dict): The changed parameters, e.g. ``{'status': 'disabled'}``.
+
+        Raises:
+            ValueError: If the command isn't defined in the configuration.
+        """
+        with self._lock:
+            commands = self.config['vcontrold_commands']['get']
+            if name not in commands:
+                raise ValueError(f"Command {name} is not defined in the config at path {self.config_file}")
+            if all(commands[name].get(key) == value for key, value in params.items()):
+                return
+            commands[name].update(params)
+
+        self.mark_dirty()
+
+    def flush(self) -> bool:
+        """Writes the configuration immediately, if it was changed.
+
+        Returns:
+            bool: True, if the configuration was written.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty is False:
+                return False
+            self.write_config(self.config)
+            self._dirty = False
+
+        return True
+
+    def close(self):
+        """Writes pending changes and stops the debounce timer."""
+        self.flush()
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def changed(self) -> bool:
+        """Returns whether the configuration file was changed, since it was read or written by this instance."""
+        return self._file_stat() != self._stat
+
+    def reload(self):
+        """Reads the changed configuration file again.
+
+        Pending changes, which weren't written yet, are discarded. If the file can't be parsed or is empty, e.g.
+        because it is still being written by an editor, the current configuration is kept.
+
+        Returns:
+            dict: The new configuration, or ``None``, if it couldn't be read.
+        """
+        with self._lock:
+            stat = self._file_stat()
+            try:
+                with open(self.config_file, "r") as conf:
+                    config = yaml.safe_load(conf)
+            except (OSError, yaml.YAMLError) as e:
+                print(f"Failed to reload the config at path {self.config_file}, keeping the current config: {e}")
+                config = None
+            self._stat = stat
+            if not isinstance(config, dict) or 'vcontrold_commands' not in config:
+                return None
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._dirty = False
+            self.config = config
+
+        return config
 
     def _create_config(self):
         if not os.path.exists(self.config_file):
@@ -828,12 +947,11 @@ class vcdConfig():
         return config
 
     def write_config(self, config: dict):
-        try:
-            with open(self.config_file, "w") as outfile:
-                yaml.safe_dump(config, outfile, default_flow_style=False)
-        except:
-            raise
+        with atomic_write(self.config_file) as outfile:
+            yaml.safe_dump(config, outfile, default_flow_style=False)
 
+        # Own writes aren't changes, which need to be reloaded
+        self._stat = self._file_stat()
         return True
 
     def get_config(self):
@@ -0,0 +1,45 @@
+import contextlib
+import os
+import stat
+import tempfile
+
+
+def _file_mode(file: str) -> int:
+    """Returns the permissions of a file, or the default permissions of a new file, if it doesn't exist."""
+    try:
+        return stat.S_IMODE(os.stat(file).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextlib.contextmanager
+def atomic_write(file: str):
+    """Replaces a file atomically with the text written to the yielded file object.
+
+    The text is written to a temporary file in the same directory, which is synced and renamed to ``file``, so
+    readers either see the previous or the complete new content. The new file keeps the permissions of the
+    replaced one. If writing fails, the temporary file is removed and ``file`` is left unchanged.
+
+    Example:
+        >>> with atomic_write("vcontrold_config.yml") as outfile:
+        ...     yaml.safe_dump(config, outfile)
+
+    Args:
+        file (str): Path to the file.
+    """
+    name = os.path.basename(file)
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file)), prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as outfile:
+            yield outfile
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        # mkstemp creates the file readable by the owner only, keep the permissions of the replaced file
+        os.chmod(tmp_file, _file_mode(file))
+        os.replace(tmp_file, file)
+    except:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
@@ -0,0 +1,88 @@
+import re
+
+# Operators of group expressions, ordered by increasing precedence: union, intersection, complement
+_TOKENS = re.compile(r"\s*(?:([()|&!*])|([^\s()|&!*]+))")
+
+
+def _tokenize(expression: str) -> list:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKENS.match(expression, position)
+        if match is None:
+            raise ValueError(f"Invalid group expression {expression!r} at position {position}")
+        tokens.append(match.group(1) or match.group(2))
+        position = match.end()
+
+    return tokens
+
+
+def compile_expression(expression: str, group_masks: dict, all_mask: int) -> int:
+    """Compiles a group expression to a bitset over the command index of a catalog.
+
+    Group names are combined with ``|`` (union), ``&`` (intersection) and ``!`` (all commands except), and can be
+    grouped with parentheses. ``*`` matches all commands. For example ``temperature & mixer`` or
+    ``* & !error & !timer``.
+
+    Args:
+        expression (str): The group expression.
+        group_masks (dict): Bitset of the commands of each group.
+        all_mask (int): Bitset of all commands.
+
+    Returns:
+        int: Bitset of the matching commands.
+
+    Raises:
+        ValueError: If the expression is invalid or refers to an unknown group.
+    """
+    tokens = _tokenize(expression)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        token = peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of group expression {expression!r}")
+        position += 1
+        return token
+
+    def union():
+        mask = intersection()
+        while peek() == "|":
+            take()
+            mask |= intersection()
+        return mask
+
+    def intersection():
+        mask = operand()
+        while peek() == "&":
+            take()
+            mask &= operand()
+        return mask
+
+    def operand():
+        token = take()
+        if token == "!":
+            return all_mask & ~operand()
+        if token == "(":
+            mask = union()
+            if take() != ")":
+                raise ValueError(f"Missing closing parenthesis in group expression {expression!r}")
+            return mask
+        if token == "*":
+            return all_mask
+        if token in ("|", "&", ")"):
+            raise ValueError(f"Unexpected {token!r} in group expression {expression!r}")
+        if token not in group_masks:
+            raise ValueError(f"Unknown group {token!r} in group expression {expression!r}")
+        return group_masks[token]
+
+    mask = union()
+    if peek() is not None:
+        raise ValueError(f"Unexpected {peek()!r} in group expression {expression!r}")
+
+    return mask
@@ -0,0 +1,241 @@
+import ast
+import collections
+import sys
+
+# Window in seconds of a derived metric, if no ``window`` is defined for it in the configuration file
+DEFAULT_METRIC_WINDOW = 3600
+
+
+def _literal(node):
+    """Returns the value of a numeric literal of a formula, or ``None``, if the node isn't a numeric literal."""
+    if sys.version_info < (3, 8):
+        # Python < 3.8 parses numbers as ast.Num instead of ast.Constant
+        value = node.n if isinstance(node, ast.Num) else None
+    else:
+        value = node.value if isinstance(node, ast.Constant) else None
+    return value if type(value) in (int, float) else None
+
+
+def numeric_value(value):
+    """Returns a sanitized value as number, or ``None``, if it isn't numeric."""
+    if type(value) == bool:
+        return int(value)
+    if type(value) in (int, float):
+        return value
+    if value in ("on", "off"):
+        return 1 if value == "on" else 0
+    return None
+
+
+class _vcdWindow:
+    """Samples of a command within a sliding time window, with running aggregates.
+
+    Adding a sample is amortized O(1): the sum is updated incrementally, and min and max are kept in monotonic
+    queues, so expired samples are dropped from the front without re-scanning the window.
+    """
+    __slots__ = ('window', 'samples', 'total', 'minimum', 'maximum')
+
+    def __init__(self, window: float):
+        self.window = window
+        self.samples = collections.deque()
+        self.total = 0.0
+        self.minimum = collections.deque()
+        self.maximum = collections.deque()
+
+    def add(self, timestamp: float, value: float):
+        self.samples.append((timestamp, value))
+        self.total += value
+        while self.minimum and self.minimum[-1][1] > value:
+            self.minimum.pop()
+        self.minimum.append((timestamp, value))
+        while self.maximum and self.maximum[-1][1] < value:
+            self.maximum.pop()
+        self.maximum.append((timestamp, value))
+
+        expired = timestamp - self.window
+        while self.samples[0][0] < expired:
+            self.total -= self.samples.popleft()[1]
+        while self.minimum[0][0] < expired:
+            self.minimum.popleft()
+        while self.maximum[0][0] < expired:
+            self.maximum.popleft()
+
+    def mean(self):
+        return self.total / len(self.samples) if self.samples else None
+
+    def sum(self):
+        return self.total if self.samples else None
+
+    def count(self):
+        return len(self.samples)
+
+    def min(self):
+        return self.minimum[0][1] if self.minimum else None
+
+    def max(self):
+        return self.maximum[0][1] if self.maximum else None
+
+    def delta(self):
+        return self.samples[-1][1] - self.samples[0][1] if len(self.samples) > 1 else None
+
+    def rate(self):
+        if len(self.samples) < 2:
+            return None
+        duration = self.samples[-1][0] - self.samples[0][0]
+        return (self.samples[-1][1] - self.samples[0][1]) / duration if duration > 0 else None
+
+
+# Functions of formulas, which aggregate the samples of a command within the window of the metric
+AGGREGATES = ('mean', 'sum', 'count', 'min', 'max', 'delta', 'rate')
+
+_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b if b != 0 else None,
+}
+
+
+class vcdMetric:
+    """A derived metric, compiled from its definition in the configuration file.
+
+    Args:
+        name (str): Name of the metric.
+        params (dict): Parameters of the metric in the configuration file.
+        metrics (vcdMetrics): The engine, which provides the latest values and the windows of the commands.
+    """
+    __slots__ = ('name', 'formula', 'window', 'unit', 'description', 'commands', '_evaluate')
+
+    def __init__(self, name: str, params: dict, metrics: 'vcdMetrics'):
+        self.name = name
+        self.formula = str(params['formula'])
+        self.window = float(params.get('window', DEFAULT_METRIC_WINDOW))
+        self.unit = params.get('unit')
+        self.description = params.get('description')
+        self.commands = set()
+        self._evaluate = self._compile(ast.parse(self.formula, mode='eval').body, metrics)
+
+    def _compile(self, node, metrics: 'vcdMetrics'):
+        """Compiles a node of the formula to a function without arguments, which returns its value or ``None``."""
+        value = _literal(node)
+        if value is not None:
+            return lambda: value
+
+        if isinstance(node, ast.Name):
+            # The latest value of a command
+            command = node.id
+            self.commands.add(command)
+            latest = metrics.latest
+            return lambda: latest.get(command)
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in AGGREGATES:
+            if len(node.args) != 1 or not isinstance(node.args[0], ast.Name) or node.keywords:
+                raise ValueError(f"{node.func.id}() expects a single command")
+            command = node.args[0].id
+            self.commands.add(command)
+            return getattr(metrics.window(command, self.window), node.func.id)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+            operator = _OPERATORS[type(node.op)]
+            left = self._compile(node.left, metrics)
+            right = self._compile(node.right, metrics)
+
+            def evaluate():
+                a = left()
+                b = right()
+                return None if a is None or b is None else operator(a, b)
+
+            return evaluate
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand = self._compile(node.operand, metrics)
+
+            def evaluate():
+                a = operand()
+                return None if a is None else -a
+
+            return evaluate
+
+        raise ValueError(f"Unsupported expression {ast.dump(node)}")
+
+    def value(self):
+        """Returns the current value of the metric, or ``None``, if there are not enough samples."""
+        value = self._evaluate()
+        return None if value is None else round(value, 3)
+
+
+class vcdMetrics:
+    """Derived metrics, which are updated incrementally from the results of the executed commands.
+
+    The metrics are defined in the section ``derived_metrics`` of the configuration file. Each metric has a
+    ``formula`` over commands and a ``window`` in seconds::
+
+        derived_metrics:
+          burner_duty_cycle:
+            formula: mean(getBrennerStatus) * 100
+            window: 3600
+            unit: '%'
+          burner_starts_per_hour:
+            formula: rate(getBrennerStarts) * 3600
+            window: 86400
+          flow_temperature_deviation_m1:
+            formula: getTempVListM1 - getTempVLsollM1
+
+    A command name is its latest value. The functions ``mean``, ``sum``, ``count``, ``min``, ``max``, ``delta``
+    (newest minus oldest value) and ``rate`` (``delta`` per second) aggregate the values of a command within the
+    window. They can be combined with numbers and ``+``, ``-``, ``*`` and ``/``.
+
+    Args:
+        definitions (dict): The section ``derived_metrics`` of the configuration file.
+    """
+
+    def __init__(self, definitions: dict = None):
+        self.latest = {}
+        self._windows = {}
+        self._by_command = {}
+        self.metrics = {}
+        self.errors = {}
+
+        for name, params in (definitions or {}).items():
+            try:
+                self.metrics[name] = vcdMetric(name, params, self)
+            except (KeyError, TypeError, ValueError, SyntaxError) as e:
+                self.errors[name] = str(e)
+
+        self.commands = frozenset().union(*(metric.commands for metric in self.metrics.values()))
+
+    def window(self, command: str, window: float) -> _vcdWindow:
+        """Returns the window of a command, shared by all metrics with the same window."""
+        key = (command, window)
+        if key not in self._windows:
+            self._windows[key] = _vcdWindow(window)
+            self._by_command.setdefault(command, []).append(self._windows[key])
+        return self._windows[key]
+
+    def update(self, result):
+        """Adds the value of a successfully executed command to the windows of the metrics, which use it.
+
+        Args:
+            result (vcdResult): The result of the command.
+        """
+        if result.command not in self.commands or result.state != "success":
+            return
+
+        value = numeric_value(result.value)
+        if value is None:
+            return
+
+        self.latest[result.command] = value
+        for window in self._by_command.get(result.command, ()):
+            window.add(result.timestamp, value)
+
+    def values(self) -> dict:
+        """Returns the current values of the metrics.
+
+        Returns:
+            dict: Metric names as keys, with dicts of the items ``value``, ``unit`` and ``description`` as value.
+        """
+        return {
+            name: dict(value=metric.value(), unit=metric.unit, description=metric.description)
+            for name, metric in self.metrics.items()
+        }
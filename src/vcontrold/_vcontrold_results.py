@@ -0,0 +1,150 @@
+import copy
+import json
+
+
+class vcdResult:
+    """The immutable result of a single executed command.
+
+    Args:
+        command (str): The executed command.
+        value: The sanitized value. ``None``, if the command failed.
+        unit (str): Unit of measurement of the value.
+        state (str): ``success``, ``failed``, ``failed_temporarily`` or ``timeout``, which includes a failed
+            connection.
+        duration (float): Execution time in seconds.
+        timestamp (float): Time of the read as unix timestamp.
+        description (str): Description of the command from the configuration file.
+        stale (bool): Whether the result was restored from a snapshot, instead of being read. Defaults to ``False``.
+    """
+    __slots__ = ('command', 'value', 'unit', 'state', 'duration', 'timestamp', 'description', 'stale')
+
+    def __init__(self, command: str, value, unit: str, state: str, duration: float, timestamp: float,
+                 description: str = None, stale: bool = False):
+        set_attr = object.__setattr__
+        set_attr(self, 'command', command)
+        set_attr(self, 'value', value)
+        set_attr(self, 'unit', unit)
+        set_attr(self, 'state', state)
+        set_attr(self, 'duration', duration)
+        set_attr(self, 'timestamp', timestamp)
+        set_attr(self, 'description', description)
+        set_attr(self, 'stale', stale)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(command={self.command!r}, value={self.value!r}, unit={self.unit!r}, state={self.state!r})"
+
+    def replace(self, **changes) -> 'vcdResult':
+        """Returns a copy of the result with the given attributes changed."""
+        attributes = {name: getattr(self, name) for name in self.__slots__}
+        attributes.update(changes)
+        return type(self)(**attributes)
+
+    def as_dict(self, exclude_timers: bool = False) -> dict:
+        """Returns the result in the format of the ``data`` items of :py:meth:`vcontrold.get_viessmann_data`.
+
+        Args:
+            exclude_timers (bool): Omits the execution time. Defaults to ``False``.
+
+        Returns:
+            dict: The value, unit, description, state and execution time of the command. Stale results
+            additionally contain ``stale`` and the ``timestamp`` of the read.
+        """
+        value = self.value
+        if type(value) in (dict, list):
+            # Parsed timers and errors, which must not be changed through the returned dict
+            value = copy.deepcopy(value)
+        result = {
+            'value': value,
+            'unit': self.unit,
+            'description': self.description,
+            'state': self.state,
+        }
+        if exclude_timers is not True:
+            result['execution_time'] = f'{round(self.duration, 3)} seconds'
+        if self.stale is True:
+            result['stale'] = True
+            result['timestamp'] = self.timestamp
+
+        return result
+
+
+class vcdResultSet:
+    """The immutable results of a single sweep.
+
+    The results are accessible by command name. Dict and JSON views are only built when requested. JSON views are
+    cached, as strings can't be modified, while each call of :py:meth:`as_dict` returns a new dict.
+
+    Args:
+        results (list): :py:class:`vcdResult` of the executed commands in execution order.
+        duration (float): Execution time of the whole sweep in seconds.
+        timestamp (float): Start of the sweep as unix timestamp.
+        meta (dict): Additional meta data of the sweep, e.g. skipped commands.
+        derived (dict): Values of the derived metrics at the end of the sweep, see :py:class:`vcdMetrics`.
+    """
+    __slots__ = ('results', 'duration', 'timestamp', 'meta', 'derived', '_by_command', '_views')
+
+    def __init__(self, results: list, duration: float, timestamp: float, meta: dict = None, derived: dict = None):
+        set_attr = object.__setattr__
+        set_attr(self, 'results', tuple(results))
+        set_attr(self, 'duration', duration)
+        set_attr(self, 'timestamp', timestamp)
+        set_attr(self, 'meta', dict(meta or {}))
+        set_attr(self, 'derived', dict(derived or {}))
+        set_attr(self, '_by_command', {result.command: result for result in self.results})
+        set_attr(self, '_views', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, command: str) -> vcdResult:
+        return self._by_command[command]
+
+    def __contains__(self, command: str) -> bool:
+        return command in self._by_command
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self._by_command)
+
+    def get(self, command: str, default=None):
+        """Returns the result of a command, or ``default``, if it wasn't executed."""
+        return self._by_command.get(command, default)
+
+    def as_dict(self, exclude_timers: bool = False) -> dict:
+        """Returns the results in the format of :py:meth:`vcontrold.get_viessmann_data`.
+
+        The dict is built on each call, so callers may modify it without affecting the result set.
+
+        Args:
+            exclude_timers (bool): Omits the execution times. Defaults to ``False``.
+
+        Returns:
+            dict: Dict with the items ``meta`` and ``data``, and ``derived``, if derived metrics are defined.
+        """
+        meta = {}
+        if exclude_timers is not True:
+            meta['execution_time'] = f'{round(self.duration, 3)} seconds'
+        meta['num_items'] = len(self._by_command)
+        meta.update(copy.deepcopy(self.meta))
+        view = dict(
+            meta=meta,
+            data={command: result.as_dict(exclude_timers) for command, result in self._by_command.items()}
+        )
+        if self.derived:
+            view['derived'] = copy.deepcopy(self.derived)
+
+        return view
+
+    def to_json(self, exclude_timers: bool = False, indent: int = 4) -> str:
+        """Returns :py:meth:`as_dict` as JSON string. The string is built once per format and cached."""
+        key = (exclude_timers, indent)
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = json.dumps(self.as_dict(exclude_timers), indent=indent)
+
+        return view
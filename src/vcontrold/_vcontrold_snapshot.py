@@ -0,0 +1,63 @@
+import json
+import time
+
+from ._vcontrold_files import atomic_write
+from ._vcontrold_results import vcdResult
+
+# Version of the snapshot format, snapshots of other versions are ignored
+SNAPSHOT_VERSION = 1
+
+# Attributes of vcdResult, which are stored per command
+_FIELDS = ('command', 'value', 'unit', 'state', 'duration', 'timestamp')
+
+
+class vcdSnapshot:
+    """Snapshot of the latest results of each command, used for warm restarts.
+
+    The results are stored as compact JSON, with one row of values per command instead of one object, so the
+    snapshot can be written frequently.
+
+    Args:
+        file (str): Path to the snapshot file.
+    """
+
+    def __init__(self, file: str):
+        self.file = file
+        self.saved_at = None
+
+    def save(self, results: list):
+        """Writes the results atomically.
+
+        Args:
+            results (list): :py:class:`vcdResult` of the commands.
+        """
+        data = dict(
+            version=SNAPSHOT_VERSION,
+            saved_at=time.time(),
+            fields=_FIELDS,
+            results=[[getattr(result, field) for field in _FIELDS] for result in results]
+        )
+
+        with atomic_write(self.file) as outfile:
+            json.dump(data, outfile, separators=(',', ':'))
+
+        self.saved_at = data['saved_at']
+
+    def load(self) -> list:
+        """Reads the snapshot file, if it exists.
+
+        Returns:
+            list: :py:class:`vcdResult` of the commands, marked as stale. Empty, if there is no valid snapshot.
+        """
+        try:
+            with open(self.file, "r") as infile:
+                data = json.load(infile)
+        except (FileNotFoundError, ValueError):
+            return []
+
+        if data.get('version') != SNAPSHOT_VERSION:
+            return []
+
+        self.saved_at = data.get('saved_at')
+        fields = data.get('fields') or _FIELDS
+        return [vcdResult(stale=True, **dict(zip(fields, row))) for row in data.get('results') or []]
@@ -0,0 +1,87 @@
+import math
+
+# Horizons in seconds of the exponentially weighted moving averages
+DEFAULT_HORIZONS = (60, 900, 3600)
+
+
+def _rounded(value):
+    return None if value is None else round(value, 4)
+
+
+class vcdStatistics:
+    """Running statistics of the values of a command, in constant memory.
+
+    Count, mean and variance are updated with Welford's algorithm. The exponentially weighted moving averages are
+    time based: a value decays to ``1/e`` of its weight after ``horizon`` seconds, independent of how often the
+    command is read.
+
+    Args:
+        horizons (tuple): Horizons in seconds of the moving averages. Defaults to 60, 900 and 3600.
+    """
+    __slots__ = ('horizons', 'count', 'mean', '_m2', 'min', 'max', 'last', 'timestamp', 'ewma')
+
+    def __init__(self, horizons: tuple = DEFAULT_HORIZONS):
+        self.horizons = tuple(horizons)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.last = None
+        self.timestamp = None
+        self.ewma = [None] * len(self.horizons)
+
+    def update(self, timestamp: float, value: float):
+        """Adds a value.
+
+        Args:
+            timestamp (float): Time of the read as unix timestamp.
+            value (float): The numeric value.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        elapsed = 0.0 if self.timestamp is None else max(0.0, timestamp - self.timestamp)
+        for index, horizon in enumerate(self.horizons):
+            average = self.ewma[index]
+            if average is None:
+                self.ewma[index] = float(value)
+            else:
+                alpha = 1.0 - math.exp(-elapsed / horizon)
+                self.ewma[index] = average + alpha * (value - average)
+
+        self.last = value
+        self.timestamp = timestamp
+
+    @property
+    def variance(self) -> float:
+        """:obj:`float`: Sample variance of the values. ``None``, if less than two values were added."""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def stddev(self) -> float:
+        """:obj:`float`: Sample standard deviation of the values. ``None``, if less than two values were added."""
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    def as_dict(self) -> dict:
+        """Returns the statistics.
+
+        Returns:
+            dict: Dict with the items ``count``, ``mean``, ``variance``, ``stddev``, ``min``, ``max``, ``last`` and
+            ``ewma``, which contains the moving average per horizon, e.g. ``900s``.
+        """
+        return dict(
+            count=self.count,
+            mean=_rounded(self.mean) if self.count > 0 else None,
+            variance=_rounded(self.variance),
+            stddev=_rounded(self.stddev),
+            min=self.min,
+            max=self.max,
+            last=self.last,
+            ewma={f"{horizon}s": _rounded(average) for horizon, average in zip(self.horizons, self.ewma)},
+        )
@@ -0,0 +1,128 @@
+import contextlib
+import threading
+
+# Lanes of vcdPriorityLock, lower lanes are served first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+
+class _vcdCall:
+    """A single in-flight call of :py:class:`vcdSingleFlight`."""
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class vcdSingleFlight:
+    """Coalesces concurrent calls with the same key into a single execution.
+
+    The first caller for a key executes the function, while all other callers, which request the same key in the
+    meantime, wait for and receive the result (or exception) of that execution.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function):
+        """Executes ``function`` once for all concurrent callers of ``key``.
+
+        Args:
+            key: Identifies identical calls, e.g. the name of a command.
+            function (callable): Function without arguments, which is executed by the first caller.
+
+        Returns:
+            The return value of ``function``.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _vcdCall()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result
+
+
+class vcdPriorityLock:
+    """Reentrant lock, which is granted to waiting threads in order of their lane.
+
+    When the lock is released, a thread waiting in the :py:data:`INTERACTIVE` lane acquires it before any thread
+    waiting in the :py:data:`BACKGROUND` lane. So a single read has to wait for at most one command of a running
+    sweep, instead of the whole sweep. Used as context manager, the lock is acquired in the interactive lane.
+
+    Args:
+        lanes (int): Number of lanes. Defaults to 2.
+    """
+
+    def __init__(self, lanes: int = 2):
+        self._condition = threading.Condition(threading.Lock())
+        self._owner = None
+        self._count = 0
+        self._waiting = [0] * lanes
+
+    def acquire(self, lane: int = INTERACTIVE):
+        """Blocks, until the lock is free and no thread waits in a lower lane.
+
+        Args:
+            lane (int): :py:data:`INTERACTIVE` or :py:data:`BACKGROUND`. Defaults to :py:data:`INTERACTIVE`.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._owner == me:
+                self._count += 1
+                return
+
+            self._waiting[lane] += 1
+            try:
+                while self._owner is not None or any(self._waiting[:lane]):
+                    self._condition.wait()
+            finally:
+                self._waiting[lane] -= 1
+            self._owner = me
+            self._count = 1
+
+    def release(self):
+        """Releases the lock, which must be held by the current thread."""
+        with self._condition:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired lock")
+            self._count -= 1
+            if self._count == 0:
+                self._owner = None
+                self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def lane(self, lane: int):
+        """Returns a context manager, which holds the lock acquired in ``lane``."""
+        self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,101 @@
+import array
+import threading
+import time
+
+SENT = 0
+RECEIVED = 1
+
+
+class vcdTranscript:
+    """Fixed-size ring buffer of the raw bytes, sent to and received from vcontrold.
+
+    All memory is allocated once, so recording an exchange only copies its bytes into the buffer. When the buffer
+    is full, the oldest entries are overwritten.
+
+    Args:
+        capacity (int): Size of the buffer for the raw bytes. Defaults to 64 KiB.
+        max_entries (int): Max number of recorded entries. Defaults to 1024.
+    """
+
+    def __init__(self, capacity: int = 65536, max_entries: int = 1024):
+        self.capacity = capacity
+        self.max_entries = max_entries
+        self._data = bytearray(capacity)
+        self._timestamps = array.array('d', [0.0]) * max_entries
+        self._starts = array.array('q', [0]) * max_entries
+        self._lengths = array.array('l', [0]) * max_entries
+        self._directions = bytearray(max_entries)
+        self._entries = 0
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def record(self, direction: int, data: bytes):
+        """Records raw bytes.
+
+        Args:
+            direction (int): :py:data:`SENT` or :py:data:`RECEIVED`.
+            data (bytes): The raw bytes.
+        """
+        timestamp = time.monotonic()
+        length = len(data)
+        if length > self.capacity:
+            data = data[-self.capacity:]
+            length = self.capacity
+
+        with self._lock:
+            start = self._written
+            offset = start % self.capacity
+            first = min(length, self.capacity - offset)
+            self._data[offset:offset + first] = data[:first]
+            if first < length:
+                self._data[:length - first] = data[first:]
+            self._written = start + length
+
+            index = self._entries % self.max_entries
+            self._timestamps[index] = timestamp
+            self._starts[index] = start
+            self._lengths[index] = length
+            self._directions[index] = direction
+            self._entries += 1
+
+    def entries(self) -> list:
+        """Returns the recorded entries, oldest first.
+
+        Entries, whose bytes were already overwritten, are omitted.
+
+        Returns:
+            list: Tuples of the monotonic timestamp, the direction and the raw bytes.
+        """
+        with self._lock:
+            entries = []
+            for number in range(max(0, self._entries - self.max_entries), self._entries):
+                index = number % self.max_entries
+                start = self._starts[index]
+                length = self._lengths[index]
+                if self._written - start > self.capacity:
+                    continue
+                offset = start % self.capacity
+                data = bytes(self._data[offset:offset + length])
+                if len(data) < length:
+                    data += bytes(self._data[:length - len(data)])
+                entries.append((self._timestamps[index], self._directions[index], data))
+
+        return entries
+
+    def format(self) -> str:
+        """Returns the recorded entries as text, one line per entry.
+
+        Each line contains the age of the entry in seconds, the direction (``>>`` sent, ``<<`` received) and the
+        raw bytes.
+        """
+        now = time.monotonic()
+        return "\n".join(
+            f"{timestamp - now:+12.6f} {'>>' if direction == SENT else '<<'} {data!r}"
+            for timestamp, direction, data in self.entries()
+        )
+
+    def clear(self):
+        """Removes all recorded entries."""
+        with self._lock:
+            self._entries = 0
+            self._written = 0
@@ -0,0 +1,173 @@
+import socket
+
+from typing import Callable
+
+PROMPT = b'vctrld>'
+
+
+class vcdTransport:
+    """Connection to vcontrold, used by :py:class:`vcontrold`.
+
+    Subclasses implement :py:meth:`connect`, :py:meth:`send`, :py:meth:`recv` and :py:meth:`close`. A timeout is
+    signaled by raising :py:exc:`socket.timeout`.
+
+    Args:
+        timeout (float): Timeout in seconds for connecting and receiving. Defaults to 10.
+    """
+
+    def __init__(self, timeout: float = 10):
+        self.timeout = timeout
+
+    def connect(self):
+        """Opens the connection."""
+        raise NotImplementedError
+
+    def send(self, data: bytes):
+        """Sends raw bytes."""
+        raise NotImplementedError
+
+    def recv(self, size: int) -> bytes:
+        """Receives up to ``size`` raw bytes."""
+        raise NotImplementedError
+
+    def close(self):
+        """Closes the connection."""
+        raise NotImplementedError
+
+
+class vcdSocketTransport(vcdTransport):
+    """Base class of the transports, which are based on a :py:class:`socket.socket`."""
+
+    def __init__(self, timeout: float = 10):
+        super().__init__(timeout)
+        self._sock = None
+
+    def _create_socket(self) -> socket.socket:
+        raise NotImplementedError
+
+    def connect(self):
+        self._sock = self._create_socket()
+
+    def send(self, data: bytes):
+        self._sock.sendall(data)
+
+    def recv(self, size: int) -> bytes:
+        return self._sock.recv(size)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class vcdTcpTransport(vcdSocketTransport):
+    """TCP connection to vcontrold.
+
+    Nagle's algorithm is disabled, as each command is a small packet, which is answered before the next one is sent.
+    TCP keepalive detects a dead connection, e.g. after vcontrold was restarted, while no commands are sent.
+
+    Args:
+        host (str): vcontrold IP address or hostname.
+        port (int): Port, on which vcontrold listens.
+        timeout (float): Timeout in seconds. Defaults to 10.
+        nodelay (bool): Sets ``TCP_NODELAY``. Defaults to ``True``.
+        keepalive (bool): Enables TCP keepalive. Defaults to ``True``.
+        keepalive_idle (int): Seconds of idleness, until keepalive probes are sent. Defaults to 60.
+        keepalive_interval (int): Seconds between keepalive probes. Defaults to 10.
+        keepalive_count (int): Unanswered keepalive probes, until the connection is dropped. Defaults to 3.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 10, nodelay: bool = True, keepalive: bool = True,
+                 keepalive_idle: int = 60, keepalive_interval: int = 10, keepalive_count: int = 3):
+        super().__init__(timeout)
+        self.host = host
+        self.port = port
+        self.nodelay = nodelay
+        self.keepalive = keepalive
+        self.keepalive_idle = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count = keepalive_count
+
+    def _create_socket(self) -> socket.socket:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        if self.nodelay is True:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.keepalive is True:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # The options are not available on all platforms
+            for option, value in (('TCP_KEEPIDLE', self.keepalive_idle), ('TCP_KEEPINTVL', self.keepalive_interval),
+                                  ('TCP_KEEPCNT', self.keepalive_count)):
+                if hasattr(socket, option):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+        return sock
+
+
+class vcdUnixTransport(vcdSocketTransport):
+    """Unix domain socket connection to a vcontrold on the same host.
+
+    Args:
+        path (str): Path of the socket.
+        timeout (float): Timeout in seconds. Defaults to 10.
+    """
+
+    def __init__(self, path: str, timeout: float = 10):
+        super().__init__(timeout)
+        self.path = path
+
+    def _create_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except:
+            sock.close()
+            raise
+
+        return sock
+
+
+class vcdMemoryTransport(vcdTransport):
+    """In-memory vcontrold for tests and benchmarks, without any socket.
+
+    Each command is answered by ``handler`` and followed by the prompt, like vcontrold does.
+
+    Example:
+        >>> transport = vcdMemoryTransport(lambda command: {'getDevType': 'V200KW2 ID=2094 Protokoll:KW'}.get(command, '1'))
+        >>> vcd = vcontrold(host=None, port=None, transport=transport)
+
+    Args:
+        handler (callable): Returns the raw response (:obj:`str`) for a command.
+        timeout (float): Unused, as there is nothing to wait for. Defaults to 10.
+    """
+
+    def __init__(self, handler: Callable[[str], str], timeout: float = 10):
+        super().__init__(timeout)
+        self.handler = handler
+        self.commands = 0
+        self._buffer = b''
+        self._connected = False
+
+    def connect(self):
+        self._connected = True
+        self._buffer = PROMPT
+
+    def send(self, data: bytes):
+        if self._connected is False:
+            raise ConnectionError("Transport is closed")
+        for command in data.decode('utf-8').splitlines():
+            self.commands += 1
+            self._buffer += f"{self.handler(command)}\n".encode('utf-8') + PROMPT
+
+    def recv(self, size: int) -> bytes:
+        if self._connected is False:
+            raise ConnectionError("Transport is closed")
+        if not self._buffer:
+            # vcontrold would never answer
+            raise socket.timeout("timed out")
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        self._connected = False
+        self._buffer = b''
@@ -0,0 +1,53 @@
+from typing import Optional
+
+
+class vcdWatchdog:
+    """Detects a stalled sweep, e.g. because the Optolink adapter hangs.
+
+    A sweep is considered stalled after ``max_timeouts`` consecutive timeouts, or if ``window`` consecutive
+    commands took longer than ``slowdown_factor`` times their expected latency (and at least ``min_latency``).
+
+    Args:
+        max_timeouts (int): Consecutive timeouts, which stall a sweep. Defaults to 2.
+        slowdown_factor (float): Factor of the expected latency, which marks a command as slow. Defaults to 5.
+        window (int): Consecutive slow commands, which stall a sweep. Defaults to 3.
+        min_latency (float): Commands faster than this number of seconds are never slow. Defaults to 1.
+    """
+
+    def __init__(self, max_timeouts: int = 2, slowdown_factor: float = 5.0, window: int = 3, min_latency: float = 1.0):
+        self.max_timeouts = max_timeouts
+        self.slowdown_factor = slowdown_factor
+        self.window = window
+        self.min_latency = min_latency
+        self.reset()
+
+    def reset(self):
+        """Resets the counters at the start of a sweep."""
+        self._timeouts = 0
+        self._slow = 0
+
+    def observe(self, result, expected_latency: float) -> Optional[str]:
+        """Checks the result of an executed command.
+
+        Args:
+            result (vcdResult): The result of the command.
+            expected_latency (float): The latency, which was expected before the command was executed.
+
+        Returns:
+            str: The reason, why the sweep stalled. ``None``, if it didn't stall.
+        """
+        if result.state == "timeout":
+            self._timeouts += 1
+            if self._timeouts >= self.max_timeouts:
+                return f"{self._timeouts} consecutive timeouts"
+        else:
+            self._timeouts = 0
+
+        if result.duration > max(self.min_latency, self.slowdown_factor * expected_latency):
+            self._slow += 1
+            if self._slow >= self.window:
+                return f"{self._slow} consecutive commands took more than {self.slowdown_factor} times their expected latency"
+        else:
+            self._slow = 0
+
+        return None
@@ -0,0 +1,195 @@
+import argparse
+import contextlib
+import json
+import signal
+import sys
+import threading
+import time
+
+from ._vcontrold_transport import vcdUnixTransport
+from .vcontrold import vcontrold
+
+
+def _ndjson(result_set) -> str:
+    """Returns a result set as single JSON line, including the start of the sweep as ``timestamp``."""
+    line = dict(timestamp=result_set.timestamp)
+    line.update(result_set.as_dict())
+    return json.dumps(line, separators=(',', ':'))
+
+
+def _transport(args):
+    """Returns the transport of ``--socket``, or ``None`` to connect via TCP to ``--host`` and ``--port``."""
+    return vcdUnixTransport(args.socket, timeout=args.timeout) if args.socket else None
+
+
+def _connect(args) -> vcontrold:
+    transport = _transport(args)
+    vcd = vcontrold(host=args.host, port=args.port, timeout=args.timeout, log_info=args.log_info,
+                    config_file=args.config, snapshot_file=args.snapshot, transport=transport)
+    vcd.output_format = "results"
+    if args.groups:
+        vcd.groups = args.groups
+    return vcd
+
+
+def _read(args) -> int:
+    """One-shot mode: executes the requested commands or a single sweep and prints the result as JSON."""
+    with _connect(args) as vcd:
+        if args.commands:
+            data = {
+                command: result.as_dict() for command, result in vcd.get_values(args.commands).items()
+                if result is not None
+            }
+            print(json.dumps(dict(meta=dict(num_items=len(data)), data=data), indent=4))
+        else:
+            print(vcd.get_viessmann_data(max_values=args.max_values, deadline=args.deadline).to_json())
+
+    return 0
+
+
+def _probe(args) -> int:
+    """Probe mode: records the commands, which are supported by the connected device."""
+    with _connect(args) as vcd:
+        capabilities = vcd.probe_capabilities()
+    print(json.dumps(capabilities, indent=4))
+
+    return 0
+
+
+def _daemon(args) -> int:
+    """Daemon mode: keeps the connection open and writes each sweep as JSON line to stdout or a file."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    output = open(args.output, "a", buffering=1) if args.output else sys.stdout
+    logs = contextlib.ExitStack()
+    if output is sys.stdout:
+        # The library logs to stdout, which would break the JSON lines
+        logs.enter_context(contextlib.redirect_stdout(sys.stderr))
+    http_server = None
+    mqtt_publisher = None
+    line_protocol_writer = None
+    sqlite_writer = None
+    try:
+        with logs, _connect(args) as vcd:
+            if args.http_port is not None:
+                from .httpserver import vcdHttpServer
+
+                http_server = vcdHttpServer(vcd, host=args.http_host, port=args.http_port, log_info=args.log_info)
+                threading.Thread(target=http_server.serve_forever, daemon=True).start()
+
+            if args.mqtt_host is not None:
+                from .mqtt import vcdMqttPublisher
+
+                mqtt_publisher = vcdMqttPublisher(vcd, host=args.mqtt_host, port=args.mqtt_port,
+                                                  prefix=args.mqtt_prefix, log_info=args.log_info)
+
+            if args.line_protocol_file is not None or args.line_protocol_url is not None:
+                from .lineprotocol import vcdLineProtocolWriter
+
+                line_protocol_writer = vcdLineProtocolWriter(vcd, file=args.line_protocol_file,
+                                                             url=args.line_protocol_url, log_info=args.log_info)
+
+            if args.sqlite is not None:
+                from .sqlite import vcdSqliteWriter
+
+                sqlite_writer = vcdSqliteWriter(vcd, args.sqlite, log_info=args.log_info)
+
+            while not stop.is_set():
+                time_start = time.monotonic()
+                try:
+                    result_set = vcd.get_viessmann_data(deadline=args.deadline)
+                    output.write(_ndjson(result_set) + "\n")
+                    output.flush()
+                except Exception as e:
+                    # Keep the daemon running, the next sweep starts on a fresh connection
+                    print(f"Sweep failed: {e!r}", file=sys.stderr)
+                    try:
+                        vcd._reconnect()
+                    except OSError as e:
+                        print(f"Failed to re-establish the connection: {e}", file=sys.stderr)
+                stop.wait(max(0.0, args.interval - (time.monotonic() - time_start)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sqlite_writer is not None:
+            sqlite_writer.close()
+        if line_protocol_writer is not None:
+            line_protocol_writer.close()
+        if mqtt_publisher is not None:
+            mqtt_publisher.close()
+        if http_server is not None:
+            http_server.shutdown()
+        if args.output:
+            output.close()
+
+    return 0
+
+
+def _proxy(args) -> int:
+    """Proxy mode: shares the connection to vcontrold between multiple clients."""
+    from .proxy import vcdProxy
+
+    proxy = vcdProxy(host=args.host, port=args.port, listen_host=args.listen_host, listen_port=args.listen_port,
+                     timeout=args.timeout, cache_ttl=args.cache_ttl, rate_limit=args.rate_limit,
+                     transport=_transport(args), log_info=args.log_info)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=proxy.shutdown).start())
+    try:
+        proxy.serve_forever()
+    except KeyboardInterrupt:
+        proxy.shutdown()
+
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pyvcontrold", description="Read data from vcontrold.")
+    parser.add_argument("--host", default="127.0.0.1", help="vcontrold IP address or hostname (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=3002, help="Port, on which vcontrold listens (default: %(default)s)")
+    parser.add_argument("--socket", default=None, help="Connect to the Unix domain socket of vcontrold instead of host and port")
+    parser.add_argument("--timeout", type=int, default=10, help="Connection timeout in seconds (default: %(default)s)")
+    parser.add_argument("--config", default="vcontrold_config.yml", help="Path to the configuration file (default: %(default)s)")
+    parser.add_argument("--log-info", action="store_true", help="Write informational logs to stdout")
+    subparsers = parser.add_subparsers(dest="mode")
+    subparsers.required = True
+
+    read = subparsers.add_parser("read", help="Read values once and print them as JSON")
+    read.add_argument("commands", nargs="*", help="Commands to read. Reads all commands, if omitted.")
+    read.add_argument("--groups", nargs="+", help="Only read commands of these groups")
+    read.add_argument("--max-values", type=int, default=None, help="Max number of executed commands")
+    read.add_argument("--deadline", type=float, default=None, help="Time budget of the sweep in seconds")
+    read.set_defaults(function=_read, snapshot=None)
+
+    probe = subparsers.add_parser("probe", help="Probe and cache the commands, supported by the device")
+    probe.set_defaults(function=_probe, groups=None, snapshot=None)
+
+    daemon = subparsers.add_parser("daemon", help="Poll values on a schedule and write them as NDJSON")
+    daemon.add_argument("--interval", type=float, default=60, help="Seconds between sweeps (default: %(default)s)")
+    daemon.add_argument("--output", default=None, help="Append NDJSON to this file instead of stdout")
+    daemon.add_argument("--groups", nargs="+", help="Only read commands of these groups")
+    daemon.add_argument("--deadline", type=float, default=None, help="Time budget of each sweep in seconds")
+    daemon.add_argument("--snapshot", default=None, help="Restore the latest values from and save them to this file")
+    daemon.add_argument("--http-port", type=int, default=None, help="Serve the latest values via HTTP on this port")
+    daemon.add_argument("--http-host", default="127.0.0.1", help="Address of the HTTP server (default: %(default)s)")
+    daemon.add_argument("--mqtt-host", default=None, help="Publish changed values to this MQTT broker")
+    daemon.add_argument("--mqtt-port", type=int, default=1883, help="Port of the MQTT broker (default: %(default)s)")
+    daemon.add_argument("--mqtt-prefix", default="vcontrold", help="Prefix of the MQTT topics (default: %(default)s)")
+    daemon.add_argument("--line-protocol-file", default=None, help="Append values as InfluxDB line protocol to this file")
+    daemon.add_argument("--sqlite", default=None, help="Store values in this SQLite database")
+    daemon.add_argument("--line-protocol-url", default=None, help="POST values as InfluxDB line protocol to this URL")
+    daemon.set_defaults(function=_daemon)
+
+    proxy = subparsers.add_parser("proxy", help="Share the connection to vcontrold between multiple clients")
+    proxy.add_argument("--listen-host", default="127.0.0.1", help="Address to listen on (default: %(default)s)")
+    proxy.add_argument("--listen-port", type=int, default=3003, help="Port to listen on (default: %(default)s)")
+    proxy.add_argument("--cache-ttl", type=float, default=30, help="Seconds, a value is cached (default: %(default)s)")
+    proxy.add_argument("--rate-limit", type=float, default=None, help="Max commands per second and client")
+    proxy.set_defaults(function=_proxy)
+
+    return parser
+
+
+def main(argv: list = None) -> int:
+    """Entry point of the ``pyvcontrold`` console script."""
+    args = _parser().parse_args(argv)
+    return args.function(args)
@@ -0,0 +1,209 @@
+import email.utils
+import gzip
+import hashlib
+import http.server
+import json
+import socketserver
+import threading
+import urllib.parse
+
+# Bodies smaller than this are sent uncompressed, as gzip wouldn't save anything
+GZIP_MIN_SIZE = 1024
+
+
+class _vcdResponse:
+    """A rendered response body with its validators.
+
+    The gzip encoded body is a different representation, so it has its own ETag.
+    """
+    __slots__ = ('body', 'etag', 'last_modified', '_gzip_body')
+
+    def __init__(self, document, last_modified: float):
+        self.body = json.dumps(document, indent=4).encode('utf-8')
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self.last_modified = int(last_modified)
+        self._gzip_body = None
+
+    @property
+    def gzip_etag(self) -> str:
+        return self.etag[:-1] + '-gzip"'
+
+    @property
+    def gzip_body(self) -> bytes:
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body)
+        return self._gzip_body
+
+
+class _vcdHttpHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the cached values of :py:class:`vcdHttpServer`."""
+
+    def do_GET(self):
+        path = urllib.parse.urlsplit(self.path).path.rstrip('/') or '/'
+        response = self.server.vcd_server._response(path)
+        if response is None:
+            self.send_error(404, "Not found")
+            return
+
+        use_gzip = len(response.body) >= GZIP_MIN_SIZE and 'gzip' in self.headers.get('Accept-Encoding', '')
+        etag = response.gzip_etag if use_gzip else response.etag
+
+        if self._not_modified(response, etag):
+            self.send_response(304)
+            self._send_validators(response, etag)
+            self.end_headers()
+            return
+
+        body = response.gzip_body if use_gzip else response.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self._send_validators(response, etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, response: _vcdResponse, etag: str) -> bool:
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return response.last_modified <= since
+
+        return False
+
+    def _send_validators(self, response: _vcdResponse, etag: str):
+        # The representation depends on Accept-Encoding, also for 304 responses
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', email.utils.formatdate(response.last_modified, usegmt=True))
+
+    def log_message(self, format, *args):
+        if self.server.vcd_server.log_info is True:
+            super().log_message(format, *args)
+
+
+class _vcdThreadingHttpServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class vcdHttpServer:
+    """
+    Local HTTP server, which serves the latest values of a :py:class:`vcontrold` instance from memory.
+
+    The server subscribes to the instance and caches the latest result of each command, so requests never reach
+    vcontrold. Responses carry an ``ETag`` and ``Last-Modified`` header, so unchanged polls are answered with
+    ``304 Not Modified``, and larger bodies are compressed with gzip, if the client accepts it.
+
+    Available paths:
+        * ``/``: All commands.
+        * ``/commands/<command>``: A single command.
+        * ``/groups``: The groups with their assigned commands, like :py:meth:`vcontrold.get_items_per_group`.
+        * ``/groups/<group>``: All commands of a group.
+
+    Args:
+        vcd (vcontrold): The instance, whose values are served.
+        host (str): Address, the server listens on. Defaults to ``127.0.0.1``.
+        port (int): Port, the server listens on. Defaults to 8080.
+        log_info (bool): Write request logs to *stderr*. Defaults to ``False``.
+
+    Example:
+        >>> vcd = vcontrold(host="127.0.0.1", port=3002)
+        >>> server = vcdHttpServer(vcd, port=8080)
+        >>> threading.Thread(target=server.serve_forever, daemon=True).start()
+        >>> vcd.get_viessmann_data()
+
+    .. versionadded:: 2.1.0
+    """
+
+    def __init__(self, vcd, host: str = "127.0.0.1", port: int = 8080, log_info: bool = False):
+        self.log_info = log_info
+        self._vcd = vcd
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._responses = {}
+
+        self._server = _vcdThreadingHttpServer((host, port), _vcdHttpHandler)
+        self._server.vcd_server = self
+
+        for result in vcd.latest_results.values():
+            self._latest[result.command] = result
+        vcd.subscribe(self.update)
+
+    @property
+    def server_address(self) -> tuple:
+        """:obj:`tuple`: Address and port, the server listens on."""
+        return self._server.server_address
+
+    def serve_forever(self):
+        """Serves requests until :py:meth:`shutdown` is called."""
+        self._server.serve_forever()
+
+    def shutdown(self):
+        """Stops serving and unsubscribes from the instance."""
+        self._vcd.unsubscribe(self.update)
+        self._server.shutdown()
+        self._server.server_close()
+
+    def update(self, result_set):
+        """Stores the results of a sweep. Called by the subscribed instance.
+
+        Args:
+            result_set (vcdResultSet): The results of the sweep.
+        """
+        with self._lock:
+            for result in result_set:
+                self._latest[result.command] = result
+            # Rendered responses are outdated now
+            self._responses = {}
+
+    def _document(self, results: list) -> tuple:
+        """Returns the document and its modification time for a list of results."""
+        data = {result.command: result.as_dict() for result in results}
+        last_modified = max((result.timestamp for result in results), default=0.0)
+        return dict(meta=dict(num_items=len(data)), data=data), last_modified
+
+    def _render(self, path: str):
+        """Renders the response of a path. Returns ``None`` for unknown paths."""
+        catalog = self._vcd.catalog
+        parts = path.strip('/').split('/') if path != '/' else []
+
+        if len(parts) == 0:
+            document, last_modified = self._document(list(self._latest.values()))
+        elif parts[0] == 'commands' and len(parts) == 2:
+            result = self._latest.get(parts[1])
+            if result is None:
+                return None
+            document, last_modified = self._document([result])
+        elif parts[0] == 'groups' and len(parts) == 1:
+            document = json.loads(self._vcd.get_items_per_group())
+            last_modified = max((result.timestamp for result in self._latest.values()), default=0.0)
+        elif parts[0] == 'groups' and len(parts) == 2:
+            if parts[1] not in catalog.groups:
+                return None
+            document, last_modified = self._document([
+                result for command, result in self._latest.items()
+                if command in catalog and parts[1] in catalog[command].groups
+            ])
+        else:
+            return None
+
+        return _vcdResponse(document, last_modified)
+
+    def _response(self, path: str):
+        """Returns the cached response of a path. Responses are rendered once per update."""
+        with self._lock:
+            response = self._responses.get(path)
+            if response is None:
+                response = self._render(path)
+                if response is not None:
+                    self._responses[path] = response
+            return response
@@ -0,0 +1,212 @@
+import threading
+import urllib.error
+import urllib.request
+
+# Tag value of commands, which aren't assigned to any group
+UNGROUPED = 'ungrouped'
+
+
+def _escape(value: str, characters: str) -> str:
+    value = value.replace('\\', '\\\\')
+    for character in characters:
+        value = value.replace(character, '\\' + character)
+    return value
+
+
+def _field_value(value):
+    """Returns a sanitized value as line protocol field value, or ``None``, if it can't be represented."""
+    if type(value) == bool:
+        return 'true' if value else 'false'
+    if type(value) == int:
+        return f'{value}i'
+    if type(value) == float:
+        return repr(value)
+    if type(value) == str:
+        return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return None
+
+
+def to_line(result, groups=(), device_id: int = None) -> str:
+    """Renders a result as InfluxDB line protocol.
+
+    The command is the measurement, the device ID, the first group in alphabetical order and the unit are tags and
+    the value is the field ``value``, with the time of the read in nanoseconds.
+
+    Args:
+        result (vcdResult): The result of a command.
+        groups (frozenset): Groups of the command. Defaults to no groups.
+        device_id (int): Device ID of the heating control system. Defaults to ``None``.
+
+    Returns:
+        str: The line without line break. ``None``, if the result failed or its value can't be represented, e.g.
+        timers.
+    """
+    if result.state != "success":
+        return None
+    value = _field_value(result.value)
+    if value is None:
+        return None
+
+    tags = ''
+    if device_id is not None:
+        tags += f',device={device_id}'
+    group = min(groups) if len(groups) > 0 else UNGROUPED
+    tags += ',group=' + _escape(group, ', =')
+    if result.unit is not None:
+        tags += ',unit=' + _escape(str(result.unit), ', =')
+
+    return f"{_escape(result.command, ', ')}{tags} value={value} {int(round(result.timestamp * 1e9))}"
+
+
+class vcdLineProtocolWriter:
+    """
+    Writes the results of each sweep as InfluxDB line protocol to a file or an HTTP endpoint.
+
+    Each sweep is rendered directly from the results into an in-memory buffer, without building the JSON document.
+    The buffer is flushed by a background thread, once it contains ``batch_size`` lines or ``flush_interval``
+    seconds passed. If the HTTP endpoint isn't reachable or fails with a server error (5xx), the lines are kept and
+    retried with the next flush; if the buffer exceeds ``max_buffer`` lines, the oldest lines are dropped and counted
+    in :py:attr:`dropped`. Batches, which are rejected with a client error (4xx), would never succeed, so they are
+    dropped, too.
+
+    Args:
+        vcd (vcontrold): The instance, whose sweeps are written.
+        file (str): Append the lines to this file. Defaults to ``None``.
+        url (str): POST the lines to this URL, e.g.
+            ``http://127.0.0.1:8086/api/v2/write?org=home&bucket=heating&precision=ns``. Defaults to ``None``.
+        token (str): Sent as ``Authorization: Token <token>`` header to ``url``. Defaults to ``None``.
+        batch_size (int): Number of lines, which trigger a flush. Defaults to 5000.
+        flush_interval (float): Max seconds between two flushes. Defaults to 10.
+        max_buffer (int): Max number of buffered lines. Defaults to 100000.
+        timeout (float): Timeout in seconds of the HTTP requests. Defaults to 10.
+        log_info (bool): Write informational logs to *stdout*. Defaults to ``False``.
+
+    Example:
+        >>> vcd = vcontrold(host="127.0.0.1", port=3002)
+        >>> writer = vcdLineProtocolWriter(vcd, file="/var/lib/vcontrold/heating.lp")
+        >>> vcd.get_viessmann_data()
+        >>> writer.close()
+
+    .. versionadded:: 2.1.0
+    """
+
+    def __init__(self, vcd, file: str = None, url: str = None, token: str = None, batch_size: int = 5000,
+                 flush_interval: float = 10, max_buffer: int = 100000, timeout: float = 10, log_info: bool = False):
+        if (file is None) == (url is None):
+            raise ValueError("Either file or url is required")
+
+        self.__log_info = log_info
+        self._vcd = vcd
+        self.__file = file
+        self.__url = url
+        self.__token = token
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__max_buffer = max_buffer
+        self.__timeout = timeout
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._flush_requested = threading.Event()
+        self._stop = threading.Event()
+        self.dropped = 0
+        self.written = 0
+
+        self._thread = threading.Thread(target=self._run, name="vcdLineProtocolWriter", daemon=True)
+        self._thread.start()
+        vcd.subscribe(self.write)
+
+    def write(self, result_set):
+        """Renders the results of a sweep into the buffer. Called by the subscribed instance.
+
+        Args:
+            result_set (vcdResultSet): The results of the sweep.
+        """
+        catalog = self._vcd.catalog
+        device_id = self._vcd.device_id
+        lines = []
+        for result in result_set:
+            groups = catalog[result.command].groups if result.command in catalog else ()
+            line = to_line(result, groups, device_id)
+            if line is not None:
+                lines.append(line)
+
+        with self._lock:
+            self._buffer.extend(lines)
+            overflow = len(self._buffer) - self.__max_buffer
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self.dropped += overflow
+            if len(self._buffer) >= self.__batch_size:
+                self._flush_requested.set()
+
+    def flush(self) -> bool:
+        """Writes the buffered lines immediately.
+
+        Returns:
+            bool: ``False``, if the lines couldn't be written and were kept in the buffer or dropped.
+        """
+        with self._lock:
+            lines = self._buffer
+            self._buffer = []
+        if len(lines) == 0:
+            return True
+
+        data = ("\n".join(lines) + "\n").encode('utf-8')
+        try:
+            if self.__file is not None:
+                with open(self.__file, "ab") as outfile:
+                    outfile.write(data)
+            else:
+                request = urllib.request.Request(self.__url, data=data, method="POST")
+                request.add_header("Content-Type", "text/plain; charset=utf-8")
+                if self.__token is not None:
+                    request.add_header("Authorization", f"Token {self.__token}")
+                with urllib.request.urlopen(request, timeout=self.__timeout) as response:
+                    response.read()
+        except urllib.error.HTTPError as e:
+            if not 400 <= e.code < 500:
+                return self._retry(lines, e)
+            if self.__log_info is True:
+                print(f"Dropped {len(lines)} lines rejected by {self.__url}: {e}")
+            with self._lock:
+                self.dropped += len(lines)
+            return False
+        except OSError as e:
+            return self._retry(lines, e)
+
+        self.written += len(lines)
+        return True
+
+    def _retry(self, lines: list, error: OSError) -> bool:
+        """Puts the lines of a failed flush back into the buffer, to retry them with the next flush."""
+        if self.__log_info is True:
+            print(f"Failed to write {len(lines)} lines to {self.__file or self.__url}: {error}")
+        with self._lock:
+            # Keep the order, the lines of the failed batch are older than the ones buffered meanwhile
+            self._buffer[:0] = lines
+            overflow = len(self._buffer) - self.__max_buffer
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self.dropped += overflow
+        return False
+
+    def close(self, timeout: float = 10):
+        """Writes the buffered lines and stops the background thread.
+
+        Args:
+            timeout (float): Max seconds to wait for the last flush. Defaults to 10.
+        """
+        self._vcd.unsubscribe(self.write)
+        self._stop.set()
+        self._flush_requested.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Flushes the buffer in batches until :py:meth:`close` is called."""
+        while not self._stop.is_set():
+            self._flush_requested.wait(self.__flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+
+        self.flush()
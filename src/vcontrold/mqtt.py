@@ -0,0 +1,325 @@
+import json
+import queue
+import select
+import socket
+import struct
+import threading
+import time
+
+# MQTT 3.1.1 control packets
+_CONNECT = 0x10
+_CONNACK = 0x20
+_PUBLISH = 0x30
+_PUBLISH_RETAIN = 0x31
+_PINGREQ = b'\xc0\x00'
+_PINGRESP = b'\xd0\x00'
+_DISCONNECT = b'\xe0\x00'
+
+# Topic level of commands, which aren't assigned to any group
+UNGROUPED = 'ungrouped'
+
+
+def _encode_length(length: int) -> bytes:
+    """Encodes the remaining length of an MQTT packet."""
+    encoded = bytearray()
+    while True:
+        digit = length % 128
+        length //= 128
+        if length > 0:
+            digit |= 0x80
+        encoded.append(digit)
+        if length == 0:
+            return bytes(encoded)
+
+
+def _encode_string(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return struct.pack('!H', len(data)) + data
+
+
+def _packet(packet_type: int, body: bytes) -> bytes:
+    return bytes((packet_type,)) + _encode_length(len(body)) + body
+
+
+def connect_packet(client_id: str, keepalive: int, username: str = None, password: str = None) -> bytes:
+    """Returns an MQTT 3.1.1 CONNECT packet with a clean session."""
+    flags = 0x02
+    payload = _encode_string(client_id)
+    if username is not None:
+        flags |= 0x80
+        payload += _encode_string(username)
+        if password is not None:
+            flags |= 0x40
+            payload += _encode_string(password)
+
+    return _packet(_CONNECT, _encode_string('MQTT') + bytes((4, flags)) + struct.pack('!H', keepalive) + payload)
+
+
+def publish_packet(topic: str, payload: bytes) -> bytes:
+    """Returns a retained MQTT PUBLISH packet with QoS 0."""
+    return _packet(_PUBLISH_RETAIN, _encode_string(topic) + payload)
+
+
+class vcdMqttPublisher:
+    """
+    Publishes the results of each sweep to an MQTT broker.
+
+    Each command is published as retained message to the topic ``<prefix>/<group>/<command>``, where ``group`` is
+    the first group of the command in alphabetical order. Only values, which changed since they were published
+    the last time, are sent. Messages are queued and sent in batches by a background thread, so a slow or
+    unreachable broker never delays the sweep. If the queue is full, new messages are dropped and counted in
+    :py:attr:`dropped`.
+
+    The publisher speaks MQTT 3.1.1 with QoS 0 and doesn't need any additional package. ``connection_factory``
+    allows to replace the network connection, e.g. by :py:class:`vcdMqttMemoryBroker` in tests.
+
+    Args:
+        vcd (vcontrold): The instance, whose sweeps are published.
+        host (str): MQTT broker IP address or hostname. Defaults to ``127.0.0.1``.
+        port (int): Port, on which the broker listens. Defaults to 1883.
+        prefix (str): First level of all topics. Defaults to ``vcontrold``.
+        client_id (str): Client identifier. Defaults to ``pyvcontrold``.
+        username (str): Username for the broker. Defaults to ``None``.
+        password (str): Password for the broker. Defaults to ``None``.
+        keepalive (int): Keepalive interval in seconds. Defaults to 60.
+        batch_size (int): Max number of messages, sent at once. Defaults to 100.
+        max_queue (int): Max number of queued messages. Defaults to 10000.
+        timeout (float): Timeout in seconds for connecting to and sending to the broker. Defaults to 10.
+        connection_factory (callable): Returns a connected socket for ``(host, port)`` and ``timeout``.
+            Defaults to :py:func:`socket.create_connection`.
+        log_info (bool): Write informational logs to *stdout*. Defaults to ``False``.
+
+    Example:
+        >>> vcd = vcontrold(host="127.0.0.1", port=3002)
+        >>> publisher = vcdMqttPublisher(vcd, host="192.168.1.10")
+        >>> vcd.get_viessmann_data()
+        >>> publisher.close()
+
+    .. versionadded:: 2.1.0
+    """
+
+    def __init__(self, vcd, host: str = "127.0.0.1", port: int = 1883, prefix: str = "vcontrold",
+                 client_id: str = "pyvcontrold", username: str = None, password: str = None, keepalive: int = 60,
+                 batch_size: int = 100, max_queue: int = 10000, timeout: float = 10, connection_factory=None,
+                 log_info: bool = False):
+        self.__log_info = log_info
+        self._vcd = vcd
+        self.__host = host
+        self.__port = port
+        self.__prefix = prefix.rstrip('/')
+        self.__client_id = client_id
+        self.__username = username
+        self.__password = password
+        self.__keepalive = keepalive
+        self.__batch_size = batch_size
+        self.__timeout = timeout
+        self.__connection_factory = connection_factory or socket.create_connection
+
+        self._sock = None
+        self._published = {}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self.dropped = 0
+
+        self._thread = threading.Thread(target=self._run, name="vcdMqttPublisher", daemon=True)
+        self._thread.start()
+        vcd.subscribe(self.publish)
+
+    def topic(self, command: str) -> str:
+        """Returns the topic of a command.
+
+        Args:
+            command (str): Name of the command.
+
+        Returns:
+            str: ``<prefix>/<group>/<command>``
+        """
+        catalog = self._vcd.catalog
+        groups = sorted(catalog[command].groups) if command in catalog else []
+        return f"{self.__prefix}/{groups[0] if len(groups) > 0 else UNGROUPED}/{command}"
+
+    def publish(self, result_set):
+        """Queues the changed values of a sweep. Called by the subscribed instance.
+
+        Args:
+            result_set (vcdResultSet): The results of the sweep.
+        """
+        for result in result_set:
+            if result.state != "success":
+                continue
+            topic = self.topic(result.command)
+            payload = json.dumps(result.value, separators=(',', ':')).encode('utf-8')
+            if self._published.get(topic) == payload:
+                continue
+            try:
+                self._queue.put_nowait((topic, payload))
+            except queue.Full:
+                self.dropped += 1
+                continue
+            self._published[topic] = payload
+
+    def close(self, timeout: float = 10):
+        """Sends the queued messages, disconnects from the broker and stops the background thread.
+
+        Args:
+            timeout (float): Max seconds to wait for queued messages. Defaults to 10.
+        """
+        self._vcd.unsubscribe(self.publish)
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _connect(self):
+        """Connects to the broker and waits for the CONNACK."""
+        self._sock = self.__connection_factory((self.__host, self.__port), self.__timeout)
+        self._sock.sendall(connect_packet(self.__client_id, self.__keepalive, self.__username, self.__password))
+        connack = b''
+        while len(connack) < 4:
+            data = self._sock.recv(4 - len(connack))
+            if not data:
+                raise ConnectionError("MQTT broker closed the connection")
+            connack += data
+        if connack[0] != _CONNACK or connack[3] != 0:
+            raise ConnectionError(f"MQTT broker refused the connection (return code {connack[3]})")
+        if self.__log_info is True:
+            print(f"Connected to MQTT broker at {self.__host}:{self.__port}")
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._sock.sendall(_DISCONNECT)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+
+    def _drain(self):
+        """Discards incoming packets (PINGRESP), so the receive buffer doesn't fill up."""
+        while select.select([self._sock], [], [], 0)[0]:
+            if not self._sock.recv(1024):
+                raise ConnectionError("MQTT broker closed the connection")
+
+    def _next_batch(self) -> list:
+        """Waits for queued messages and returns up to ``batch_size`` of them."""
+        try:
+            batch = [self._queue.get(timeout=min(1.0, self.__keepalive / 2))]
+        except queue.Empty:
+            return []
+        while len(batch) < self.__batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Sends queued messages in batches until :py:meth:`close` is called."""
+        batch = []
+        backoff = 1.0
+        last_sent = time.monotonic()
+
+        while not (self._stop.is_set() and len(batch) == 0 and self._queue.empty()):
+            if len(batch) == 0:
+                batch = self._next_batch()
+            try:
+                if self._sock is None:
+                    if len(batch) == 0:
+                        continue
+                    self._connect()
+                self._drain()
+                if len(batch) > 0:
+                    self._sock.sendall(b''.join(publish_packet(topic, payload) for topic, payload in batch))
+                    batch = []
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= self.__keepalive / 2:
+                    self._sock.sendall(_PINGREQ)
+                    last_sent = time.monotonic()
+                backoff = 1.0
+            except OSError as e:
+                if self.__log_info is True:
+                    print(f"Failed to publish to MQTT broker at {self.__host}:{self.__port}: {e}")
+                self._disconnect()
+                if self._stop.wait(backoff):
+                    break
+                backoff = min(backoff * 2, 60.0)
+
+        self._disconnect()
+
+
+class vcdMqttMemoryBroker:
+    """
+    In-process MQTT broker stand-in for tests, without any network connection.
+
+    Pass :py:meth:`connect` as ``connection_factory`` to :py:class:`vcdMqttPublisher`. Each connection is a
+    :py:func:`socket.socketpair`, whose other end is served by a background thread. The broker accepts every
+    CONNECT, answers PINGREQ and records the retained messages per topic.
+
+    Example:
+        >>> broker = vcdMqttMemoryBroker()
+        >>> publisher = vcdMqttPublisher(vcd, connection_factory=broker.connect)
+        >>> vcd.get_viessmann_data()
+        >>> publisher.close()
+        >>> broker.messages['vcontrold/temperature/getTempA']
+        b'12.5'
+
+    .. versionadded:: 2.1.0
+    """
+
+    def __init__(self):
+        self.messages = {}
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def connect(self, address: tuple, timeout: float = None) -> socket.socket:
+        """Returns the client end of a new connection to the broker.
+
+        Args:
+            address (tuple): Ignored, as there is no network connection.
+            timeout (float): Timeout in seconds of the client end. Defaults to ``None`` (blocking).
+
+        Returns:
+            socket.socket: The connected socket.
+        """
+        client, server = socket.socketpair()
+        client.settimeout(timeout)
+        with self._lock:
+            self.connections += 1
+        threading.Thread(target=self._serve, args=(server,), name="vcdMqttMemoryBroker", daemon=True).start()
+        return client
+
+    @staticmethod
+    def _read_packet(rfile) -> tuple:
+        """Reads a packet, returns its first byte and its body. ``None``, if the client disconnected."""
+        header = rfile.read(1)
+        if not header:
+            return None
+        length = 0
+        multiplier = 1
+        while True:
+            digit = rfile.read(1)[0]
+            length += (digit & 0x7f) * multiplier
+            multiplier *= 128
+            if digit & 0x80 == 0:
+                break
+
+        return header[0], rfile.read(length)
+
+    def _serve(self, sock: socket.socket):
+        """Serves a single connection, until the client disconnects."""
+        with sock, sock.makefile('rb') as rfile:
+            while True:
+                try:
+                    packet = self._read_packet(rfile)
+                except (OSError, IndexError):
+                    break
+                if packet is None or packet[0] == _DISCONNECT[0]:
+                    break
+
+                packet_type, body = packet
+                if packet_type == _CONNECT:
+                    sock.sendall(bytes((_CONNACK, 2, 0, 0)))
+                elif packet_type & 0xf0 == _PUBLISH:
+                    length = struct.unpack('!H', body[:2])[0]
+                    with self._lock:
+                        self.messages[body[2:2 + length].decode('utf-8')] = body[2 + length:]
+                elif packet == (_PINGREQ[0], b''):
+                    sock.sendall(_PINGRESP)
@@ -0,0 +1,130 @@
+import math
+
+# NumPy is an optional dependency: pip install pyvcontrold-net[numpy]
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TIMESTAMP_COLUMN = 'timestamp'
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("NumPy is required for the export. Install it with 'pip install pyvcontrold-net[numpy]'.")
+
+
+def _as_float(value) -> float:
+    """Converts a sanitized value to float. Returns NaN for values, which are not numeric."""
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value == "on":
+        return 1.0
+    if value == "off":
+        return 0.0
+    return math.nan
+
+
+def _is_numeric(value) -> bool:
+    return isinstance(value, (bool, int, float)) or value in ("on", "off")
+
+
+def to_array(result_sets, commands: list = None):
+    """Converts collected results to a structured array with one row per sweep.
+
+    Args:
+        result_sets (iterable): :py:class:`vcdResultSet` of the collected sweeps.
+        commands (list): Commands to export. Defaults to ``None``, which exports all numeric commands.
+
+    Returns:
+        numpy.ndarray: Structured array with the float column ``timestamp`` (start of the sweep as unix timestamp)
+        and one float column per command. Missing or failed reads are NaN.
+    """
+    _require_numpy()
+    result_sets = list(result_sets)
+
+    if commands is None:
+        commands = []
+        for result_set in result_sets:
+            for result in result_set:
+                if result.command not in commands and result.state == "success" and _is_numeric(result.value):
+                    commands.append(result.command)
+
+    dtype = [(TIMESTAMP_COLUMN, 'f8')] + [(command, 'f8') for command in commands]
+    array = numpy.full(len(result_sets), numpy.nan, dtype=dtype)
+    array[TIMESTAMP_COLUMN] = [result_set.timestamp for result_set in result_sets]
+
+    for command in commands:
+        array[command] = [
+            _as_float(result.value) if result is not None and result.state == "success" else math.nan
+            for result in (result_set.get(command) for result_set in result_sets)
+        ]
+
+    return array
+
+
+def celsius_to_fahrenheit(values):
+    """Converts temperatures from Celsius to Fahrenheit.
+
+    Args:
+        values (numpy.ndarray): Temperatures in Celsius.
+
+    Returns:
+        numpy.ndarray: Temperatures in Fahrenheit.
+    """
+    _require_numpy()
+    return numpy.asarray(values, dtype='f8') * 1.8 + 32
+
+
+def fahrenheit_to_celsius(values):
+    """Converts temperatures from Fahrenheit to Celsius.
+
+    Args:
+        values (numpy.ndarray): Temperatures in Fahrenheit.
+
+    Returns:
+        numpy.ndarray: Temperatures in Celsius.
+    """
+    _require_numpy()
+    return (numpy.asarray(values, dtype='f8') - 32) / 1.8
+
+
+def resample(array, step: float, start: float = None, end: float = None):
+    """Resamples an array of :py:func:`to_array` onto a regular time grid.
+
+    Each column is linearly interpolated between its valid values. Grid points before the first or after the
+    last valid value of a column are NaN.
+
+    Args:
+        array (numpy.ndarray): Structured array, returned by :py:func:`to_array`.
+        step (float): Distance between the grid points in seconds.
+        start (float): First grid point as unix timestamp. Defaults to the first timestamp of ``array``.
+        end (float): Last possible grid point as unix timestamp. Defaults to the last timestamp of ``array``.
+
+    Returns:
+        numpy.ndarray: Structured array with the same columns, containing one row per grid point.
+    """
+    _require_numpy()
+    timestamps = array[TIMESTAMP_COLUMN]
+    if start is None:
+        start = timestamps.min() if len(timestamps) > 0 else 0.0
+    if end is None:
+        end = timestamps.max() if len(timestamps) > 0 else start
+
+    grid = numpy.arange(start, end + step / 2, step)
+    resampled = numpy.full(len(grid), numpy.nan, dtype=array.dtype)
+    resampled[TIMESTAMP_COLUMN] = grid
+
+    order = numpy.argsort(timestamps, kind='stable')
+    timestamps = timestamps[order]
+    for column in array.dtype.names:
+        if column == TIMESTAMP_COLUMN:
+            continue
+        values = array[column][order]
+        valid = ~numpy.isnan(values)
+        if valid.any():
+            resampled[column] = numpy.interp(grid, timestamps[valid], values[valid], left=numpy.nan, right=numpy.nan)
+
+    return resampled
@@ -0,0 +1,228 @@
+import socketserver
+import threading
+import time
+
+from ._vcontrold_sync import vcdSingleFlight
+from ._vcontrold_transport import vcdTransport, vcdTcpTransport
+
+PROMPT = 'vctrld>'
+# Responses, which signal a failed command and therefore must not be cached
+FAILED_RESPONSES = ('NOT OK', 'command unknown', 'Wrong result, terminating')
+
+
+class _vcdProxyHandler(socketserver.StreamRequestHandler):
+    """Speaks the vcontrold protocol with a single downstream client."""
+
+    def handle(self):
+        proxy = self.server.proxy
+        bucket = proxy._bucket()
+
+        try:
+            self._serve(proxy, bucket)
+        except ConnectionError:
+            # Client disconnected without sending quit
+            pass
+
+    def _serve(self, proxy, bucket: list):
+        """Serves commands of the client, until it quits or disconnects."""
+        while True:
+            self.wfile.write(PROMPT.encode())
+            line = self.rfile.readline()
+            if not line:
+                break
+
+            command = line.decode('utf-8').strip()
+            if command == "":
+                continue
+            if command == "quit":
+                self.wfile.write('good bye!\n'.encode())
+                break
+
+            proxy._throttle(bucket)
+            try:
+                response = proxy.execute(command)
+            except OSError as e:
+                response = f"ERR: upstream connection failed ({e})\n"
+            self.wfile.write(response.encode())
+
+
+class _vcdProxyServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class vcdProxy:
+    """
+    Multiplexing proxy, which shares a single connection to vcontrold between many clients.
+
+    vcontrold serves its clients one after another over a single Optolink. The proxy holds the only upstream
+    connection and speaks the same ``vctrld>`` protocol downstream, so that any number of :py:class:`vcontrold`
+    instances (or other vcontrold clients) can connect to the proxy instead. Values of ``get`` commands are served
+    from a cache for ``cache_ttl`` seconds and concurrent requests for the same command are merged into a single
+    upstream read, which keeps the load on the Optolink independent of the number of clients.
+
+    Args:
+        host (str): vcontrold IP address or hostname
+        port (int): Port, on which vcontrold listens
+        listen_host (str): Address, the proxy listens on. Defaults to ``127.0.0.1``.
+        listen_port (int): Port, the proxy listens on. Defaults to 3003.
+        timeout (int): Timeout in seconds for the upstream connection. Defaults to 10.
+        cache_ttl (float): Seconds, a returned value is served from cache. Defaults to 30.
+        rate_limit (float): Max commands per second and connection. Defaults to ``None`` (no limit).
+        rate_burst (int): Number of commands a connection may send at once, before ``rate_limit`` applies. Defaults
+            to 10.
+        transport (vcdTransport): Upstream connection to vcontrold, e.g. :py:class:`vcdUnixTransport`. Defaults to
+            ``None``, which connects via :py:class:`vcdTcpTransport` to ``host`` and ``port``.
+        log_info (bool): Write informational logs to *stdout*. Defaults to ``False``.
+
+    Example:
+        >>> from vcontrold.proxy import vcdProxy
+        >>> proxy = vcdProxy(host="127.0.0.1", port=3002, listen_port=3003)
+        >>> proxy.serve_forever()
+
+    .. versionadded:: 2.1.0
+    """
+
+    def __init__(self, host: str, port: int, listen_host: str = "127.0.0.1", listen_port: int = 3003,
+                 timeout: int = 10, cache_ttl: float = 30, rate_limit: float = None, rate_burst: int = 10,
+                 transport: vcdTransport = None, log_info: bool = False):
+        self.__log_info = log_info
+
+        # Upstream
+        self.__upstream = getattr(transport, 'path', None) or f"{host}:{port}"
+        self._transport = transport if transport is not None else vcdTcpTransport(host, port, timeout)
+        self._connected = False
+        self._prompt_received = False
+        self._upstream_lock = threading.Lock()
+        self._single_flight = vcdSingleFlight()
+
+        # Cache
+        self.__cache_ttl = cache_ttl
+        self._cache = {}
+
+        # Rate limits per connection
+        self.__rate_limit = rate_limit
+        self.__rate_burst = rate_burst
+
+        # Statistics
+        self.upstream_reads = 0
+        self.cache_hits = 0
+
+        self._server = _vcdProxyServer((listen_host, listen_port), _vcdProxyHandler)
+        self._server.proxy = self
+
+    @property
+    def server_address(self) -> tuple:
+        """:obj:`tuple`: Address and port, the proxy listens on."""
+        return self._server.server_address
+
+    def serve_forever(self):
+        """Serves downstream clients until :py:meth:`shutdown` is called."""
+        if self.__log_info is True:
+            print(f"Proxy for vcontrold at {self.__upstream} listens on {self.server_address[0]}:{self.server_address[1]}")
+        self._server.serve_forever()
+
+    def shutdown(self):
+        """Stops serving and closes the upstream connection."""
+        self._server.shutdown()
+        self._server.server_close()
+        with self._upstream_lock:
+            self._close()
+
+    def _connect(self):
+        """Connects to vcontrold"""
+        self._prompt_received = False
+        self._transport.connect()
+        self._connected = True
+
+    def _close(self):
+        """Closes connection to vcontrold"""
+        if self._connected is True:
+            self._connected = False
+            self._transport.close()
+
+    def _read_upstream(self, command: str) -> str:
+        """Executes a command against vcontrold. Reconnects once, if the connection was lost.
+
+        Once a command was sent, it is only sent again, if it's a ``get`` command, as other commands may have been
+        applied by vcontrold already.
+        """
+        with self._upstream_lock:
+            for attempt in (1, 2):
+                sent = False
+                try:
+                    if self._connected is False:
+                        self._connect()
+                    if self._prompt_received is False:
+                        data = self._transport.recv(1000).decode('utf-8')
+                        if data != PROMPT and self.__log_info is True:
+                            print(f"Returned data is unexpected. Prompt '{PROMPT}' expected, but received '{data}'")
+                    self._prompt_received = False
+                    sent = True
+                    self._transport.send(f'{command}\n'.encode())
+                    data = self._transport.recv(1000).decode('utf-8')
+                    if data == "":
+                        raise ConnectionResetError("vcontrold closed the connection")
+                    if data.endswith(PROMPT):
+                        # The next prompt was received together with the response
+                        self._prompt_received = True
+                        data = data[:-len(PROMPT)]
+                    self.upstream_reads += 1
+                    return data
+                except OSError:
+                    self._close()
+                    if attempt == 2 or (sent is True and not command.startswith('get')):
+                        raise
+
+    def execute(self, command: str) -> str:
+        """Returns the response of vcontrold for a command.
+
+        Responses of ``get`` commands are served from cache, as long as they are not older than ``cache_ttl``.
+        Concurrent requests for the same command are merged into a single upstream read. All other commands are
+        passed through and invalidate the cache, as they may change values.
+
+        Args:
+            command (str): The command to be executed against vcontrold.
+
+        Returns:
+            str: The raw response of vcontrold.
+        """
+        if not command.startswith('get'):
+            response = self._read_upstream(command)
+            self._cache.clear()
+            return response
+
+        cached = self._cache.get(command)
+        if cached is not None and time.monotonic() - cached[0] < self.__cache_ttl:
+            self.cache_hits += 1
+            return cached[1]
+
+        return self._single_flight.do(command, lambda: self._read_cached(command))
+
+    def _read_cached(self, command: str) -> str:
+        """Reads a command from vcontrold and caches successful responses."""
+        response = self._read_upstream(command)
+        if not any(failed in response for failed in FAILED_RESPONSES):
+            self._cache[command] = (time.monotonic(), response)
+        return response
+
+    def _bucket(self) -> list:
+        """Returns a full token bucket for a new connection: the remaining tokens and the time of the last command."""
+        return [self.__rate_burst, time.monotonic()]
+
+    def _throttle(self, bucket: list):
+        """Delays a connection, which exceeds its rate limit.
+
+        Args:
+            bucket (list): Token bucket of the connection, which is updated in place. It's only used by the thread
+                of the connection and discarded on disconnect.
+        """
+        if self.__rate_limit is None:
+            return
+
+        now = time.monotonic()
+        tokens = min(self.__rate_burst, bucket[0] + (now - bucket[1]) * self.__rate_limit) - 1
+        bucket[0], bucket[1] = tokens, now
+
+        if tokens < 0:
+            time.sleep(-tokens / self.__rate_limit)
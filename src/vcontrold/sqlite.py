@@ -0,0 +1,299 @@
+import json
+import math
+import sqlite3
+import threading
+import time
+
+from ._vcontrold_metrics import numeric_value
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commands (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    unit TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS readings (
+    command_id INTEGER NOT NULL REFERENCES commands (id),
+    timestamp REAL NOT NULL,
+    value REAL,
+    text TEXT,
+    PRIMARY KEY (command_id, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    command_id INTEGER NOT NULL REFERENCES commands (id),
+    bucket REAL NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL,
+    min REAL,
+    max REAL,
+    PRIMARY KEY (command_id, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS readings_timestamp ON readings (timestamp);
+"""
+
+
+class vcdSqliteWriter:
+    """
+    Stores the results of each sweep in a SQLite database.
+
+    Commands are stored once in the table ``commands``, and each successful read as a narrow row of the command
+    ID, the time of the read and either the numeric ``value`` or the JSON encoded ``text`` in the table
+    ``readings``. Its primary key is ``(command_id, timestamp)``, so time range queries of a command read
+    consecutive pages.
+
+    Rows are buffered and inserted with ``executemany`` in a single transaction per batch by a background thread,
+    with the database in WAL mode. If the database can't be written, the rows are kept and retried with the next
+    batch; if the buffer exceeds ``max_buffer`` rows, the oldest rows are dropped and counted in :py:attr:`dropped`.
+    Once per ``maintenance_interval``, numeric readings older than ``raw_retention`` seconds are downsampled to
+    ``count``, ``mean``, ``min`` and ``max`` per ``bucket`` seconds in the table ``rollups``, and deleted
+    afterwards. Text readings can't be downsampled and are deleted after ``text_retention`` seconds.
+
+    Args:
+        vcd (vcontrold): The instance, whose sweeps are stored.
+        file (str): Path to the database file.
+        batch_size (int): Number of rows, which trigger an insert. Defaults to 1000.
+        flush_interval (float): Max seconds between two inserts. Defaults to 10.
+        raw_retention (float): Seconds, readings are kept before they are rolled up. Defaults to 7 days.
+        bucket (float): Seconds per rollup. Defaults to 3600.
+        rollup_retention (float): Seconds, rollups are kept. Defaults to ``None`` (forever).
+        text_retention (float): Seconds, text readings are kept. Defaults to ``None`` (forever).
+        maintenance_interval (float): Seconds between two rollups. Defaults to 3600.
+        max_buffer (int): Max number of buffered rows. Defaults to 100000.
+        log_info (bool): Write informational logs to *stdout*. Defaults to ``False``.
+
+    Example:
+        >>> vcd = vcontrold(host="127.0.0.1", port=3002)
+        >>> writer = vcdSqliteWriter(vcd, "/var/lib/vcontrold/heating.db")
+        >>> vcd.get_viessmann_data()
+        >>> writer.readings('getTempA', start=time.time() - 86400)
+
+    .. versionadded:: 2.1.0
+    """
+
+    def __init__(self, vcd, file: str, batch_size: int = 1000, flush_interval: float = 10,
+                 raw_retention: float = 7 * 86400, bucket: float = 3600, rollup_retention: float = None,
+                 text_retention: float = None, maintenance_interval: float = 3600, max_buffer: int = 100000,
+                 log_info: bool = False):
+        self.__log_info = log_info
+        self._vcd = vcd
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__raw_retention = raw_retention
+        self.__bucket = bucket
+        self.__rollup_retention = rollup_retention
+        self.__text_retention = text_retention
+        self.__maintenance_interval = maintenance_interval
+        self.__max_buffer = max_buffer
+
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(file, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._command_ids = dict(self._db.execute("SELECT name, id FROM commands"))
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._flush_requested = threading.Event()
+        self._stop = threading.Event()
+        self.dropped = 0
+        self.written = 0
+
+        self._thread = threading.Thread(target=self._run, name="vcdSqliteWriter", daemon=True)
+        self._thread.start()
+        vcd.subscribe(self.write)
+
+    def write(self, result_set):
+        """Buffers the successful results of a sweep. Called by the subscribed instance.
+
+        Args:
+            result_set (vcdResultSet): The results of the sweep.
+        """
+        rows = []
+        for result in result_set:
+            if result.state != "success":
+                continue
+            value = numeric_value(result.value)
+            text = json.dumps(result.value, separators=(',', ':')) if value is None else None
+            rows.append((result.command, result.unit, result.description, result.timestamp, value, text))
+
+        with self._lock:
+            self._buffer.extend(rows)
+            self._limit_buffer()
+            if len(self._buffer) >= self.__batch_size:
+                self._flush_requested.set()
+
+    def flush(self):
+        """Inserts the buffered rows in a single transaction."""
+        with self._lock:
+            rows = self._buffer
+            self._buffer = []
+        if len(rows) == 0:
+            return
+
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                for command, unit, description, _, _, _ in rows:
+                    if command not in self._command_ids:
+                        self._command_ids[command] = self._db.execute(
+                            "INSERT INTO commands (name, unit, description) VALUES (?, ?, ?)",
+                            (command, unit, description)
+                        ).lastrowid
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO readings (command_id, timestamp, value, text) VALUES (?, ?, ?, ?)",
+                    [(self._command_ids[command], timestamp, value, text)
+                     for command, _, _, timestamp, value, text in rows]
+                )
+                self._db.execute("COMMIT")
+            except:
+                self._db.execute("ROLLBACK")
+                # Inserted commands were rolled back, too
+                self._command_ids = dict(self._db.execute("SELECT name, id FROM commands"))
+                with self._lock:
+                    # Keep the order, the rows of the failed batch are older than the ones buffered meanwhile
+                    self._buffer[:0] = rows
+                    self._limit_buffer()
+                raise
+
+        self.written += len(rows)
+
+    def _limit_buffer(self):
+        """Drops the oldest rows, if the buffer exceeds ``max_buffer``. Requires the lock of the buffer."""
+        overflow = len(self._buffer) - self.__max_buffer
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+
+    def rollup(self, now: float = None) -> int:
+        """Downsamples the numeric readings, which are older than ``raw_retention``, and deletes them.
+
+        Only complete buckets are rolled up. Readings, which are inserted late into a bucket, which was already
+        rolled up, are merged into its rollup. Text readings older than ``text_retention`` and rollups older than
+        ``rollup_retention`` are deleted.
+
+        Args:
+            now (float): Current time as unix timestamp. Defaults to the current time.
+
+        Returns:
+            int: Number of deleted readings.
+        """
+        now = time.time() if now is None else now
+        bucket = self.__bucket
+        cutoff = math.floor((now - self.__raw_retention) / bucket) * bucket
+
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute(
+                    """
+                    INSERT INTO rollups (command_id, bucket, count, mean, min, max)
+                    SELECT command_id, CAST(timestamp / :bucket AS INTEGER) * :bucket AS start, COUNT(value), AVG(value),
+                           MIN(value), MAX(value)
+                    FROM readings
+                    WHERE timestamp < :cutoff AND value IS NOT NULL
+                    GROUP BY command_id, start
+                    ON CONFLICT (command_id, bucket) DO UPDATE SET
+                        count = count + excluded.count,
+                        mean = (mean * count + excluded.mean * excluded.count) / (count + excluded.count),
+                        min = MIN(min, excluded.min),
+                        max = MAX(max, excluded.max)
+                    """,
+                    dict(bucket=bucket, cutoff=cutoff)
+                )
+                deleted = self._db.execute(
+                    "DELETE FROM readings WHERE timestamp < ? AND value IS NOT NULL", (cutoff,)
+                ).rowcount
+                if self.__text_retention is not None:
+                    deleted += self._db.execute(
+                        "DELETE FROM readings WHERE timestamp < ? AND value IS NULL", (now - self.__text_retention,)
+                    ).rowcount
+                if self.__rollup_retention is not None:
+                    self._db.execute("DELETE FROM rollups WHERE bucket < ?", (now - self.__rollup_retention,))
+                self._db.execute("COMMIT")
+            except:
+                self._db.execute("ROLLBACK")
+                raise
+
+        if self.__log_info is True:
+            print(f"Rolled up {deleted} readings older than {cutoff}")
+        return deleted
+
+    def readings(self, command: str, start: float = None, end: float = None) -> list:
+        """Returns the stored readings of a command.
+
+        Args:
+            command (str): Name of the command.
+            start (float): Unix timestamp of the first reading. Defaults to ``None`` (all).
+            end (float): Unix timestamp, before which the readings end. Defaults to ``None`` (all).
+
+        Returns:
+            list: Tuples of the timestamp and the value, ordered by time.
+        """
+        with self._db_lock:
+            rows = self._db.execute(
+                """
+                SELECT timestamp, value, text FROM readings
+                WHERE command_id = (SELECT id FROM commands WHERE name = ?) AND timestamp >= ? AND timestamp < ?
+                ORDER BY timestamp
+                """,
+                (command, -math.inf if start is None else start, math.inf if end is None else end)
+            ).fetchall()
+
+        return [(timestamp, value if text is None else json.loads(text)) for timestamp, value, text in rows]
+
+    def rollups(self, command: str, start: float = None, end: float = None) -> list:
+        """Returns the rollups of a command.
+
+        Args:
+            command (str): Name of the command.
+            start (float): Unix timestamp of the first bucket. Defaults to ``None`` (all).
+            end (float): Unix timestamp, before which the buckets end. Defaults to ``None`` (all).
+
+        Returns:
+            list: Tuples of the start of the bucket, count, mean, min and max, ordered by time.
+        """
+        with self._db_lock:
+            return self._db.execute(
+                """
+                SELECT bucket, count, mean, min, max FROM rollups
+                WHERE command_id = (SELECT id FROM commands WHERE name = ?) AND bucket >= ? AND bucket < ?
+                ORDER BY bucket
+                """,
+                (command, -math.inf if start is None else start, math.inf if end is None else end)
+            ).fetchall()
+
+    def close(self, timeout: float = 10):
+        """Inserts the buffered rows, stops the background thread and closes the database.
+
+        Args:
+            timeout (float): Max seconds to wait for the last insert. Defaults to 10.
+        """
+        self._vcd.unsubscribe(self.write)
+        self._stop.set()
+        self._flush_requested.set()
+        self._thread.join(timeout)
+        with self._db_lock:
+            self._db.close()
+
+    def _run(self):
+        """Inserts the buffered rows in batches and rolls up old readings, until :py:meth:`close` is called."""
+        last_maintenance = time.monotonic()
+        while not self._stop.is_set():
+            self._flush_requested.wait(self.__flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+                if time.monotonic() - last_maintenance >= self.__maintenance_interval:
+                    last_maintenance = time.monotonic()
+                    self.rollup()
+            except sqlite3.Error as e:
+                if self.__log_info is True:
+                    print(f"Failed to write to SQLite database: {e}")
+
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            if self.__log_info is True:
+                print(f"Failed to write to SQLite database: {e}")
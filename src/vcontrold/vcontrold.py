@@ -1,4 +1,5 @@
 import atexit
+import collections
 import datetime
 import json
 import socket
@@ -7,10 +8,42 @@ import csv
 import tempfile
 import pathlib
 import sys
+import threading
+import weakref
 
+from ._vcontrold_breaker import vcdCircuitBreaker
+from ._vcontrold_capabilities import vcdCapabilities
+from ._vcontrold_catalog import vcdCommand, vcdCatalog, load_catalog
 from ._vcontrold_config import vcdConfig
+from ._vcontrold_metrics import vcdMetrics, numeric_value
+from ._vcontrold_results import vcdResult, vcdResultSet
+from ._vcontrold_snapshot import vcdSnapshot
+from ._vcontrold_statistics import vcdStatistics
+from ._vcontrold_sync import vcdSingleFlight, vcdPriorityLock, INTERACTIVE, BACKGROUND
+from ._vcontrold_transcript import vcdTranscript, SENT, RECEIVED
+from ._vcontrold_transport import vcdTransport, vcdTcpTransport
+from ._vcontrold_watchdog import vcdWatchdog
 from typing import Union, Optional
 
+# Prompt, which vcontrold sends before it accepts the next command
+PROMPT = 'vctrld>'
+# Instances, which are closed at exit, if they were not closed explicitly
+_open_instances = weakref.WeakSet()
+
+
+def _close_open_instances():
+    """Closes all instances, which are still open at interpreter exit."""
+    for instance in list(_open_instances):
+        instance.close()
+
+
+atexit.register(_close_open_instances)
+
+# Expected execution time of a command in seconds, as long as no latency was measured for it
+DEFAULT_COMMAND_LATENCY = 2.5
+# Weight of the latest measurement within the moving average of a command latency
+LATENCY_SMOOTHING = 0.3
+
 
 class vcontrold:
     """
@@ -25,19 +58,33 @@ class vcontrold:
         where only the pure data is relevant. If you use the module for other purposes, it could make sense to enable
         informational logging, by calling with ``log_info=True``.
 
+    An instance can be shared between threads. Commands are sent to vcontrold one after another and concurrent
+    requests for the same command, while it is already executed, receive the result of that single execution.
+
+    Call :py:meth:`close` or use the instance as context manager, to close the connection and write pending changes
+    of the configuration. Instances, which are still open at exit, are closed automatically.
+
     Args:
         host (str): vcontrold IP address or hostname
         port (int): Port, on which vcontrold listens
         timeout (int): Timeout in seconds to establish a tcp connection. Defaults to 10.
         log_info (bool): Write informational logs to *stdout*. Defaults to ``False``.
         log_debug (bool): Write debug logs to *stdout*. Defaults to ``False``.
+        config_file (str): Path to the configuration file. Defaults to ``vcontrold_config.yml`` in the directory of
+            the executed script.
+        snapshot_file (str): Path to a snapshot file, to which the latest results are written periodically and at
+            close. They are restored from it at startup. Defaults to ``None``, which disables snapshots.
+        transport (vcdTransport): Connection to vcontrold, e.g. :py:class:`vcdUnixTransport` for a vcontrold on
+            the same host or :py:class:`vcdMemoryTransport` for tests. Defaults to ``None``, which connects via
+            :py:class:`vcdTcpTransport` to ``host`` and ``port``.
 
     Todo:
         * Multi-language support (at least english)
         * Caching for returned data
     """
 
-    def __init__(self, host: str, port: int, timeout: int = 10, log_info: bool = False, log_debug: bool = False):
+    def __init__(self, host: str, port: int, timeout: int = 10, log_info: bool = False, log_debug: bool = False,
+                 config_file: str = None, snapshot_file: str = None, transport: vcdTransport = None):
         # Logging
         self.__log_info = log_info
         self.__log_debug = log_debug
@@ -46,22 +93,34 @@ class vcontrold:
         self.__host = host
         self.__port = port
         self.__timeout = timeout
+        self._transport = transport if transport is not None else vcdTcpTransport(host, port, timeout)
+        self.__prompt_received = False
+        # Set after a timeout, as a late response would be read as the response of the next command
+        self.__connection_stale = False
+        # Serializes the access to the connection and the shared data between threads. Single reads are granted
+        # the connection before the commands of a running sweep.
+        self._sock_lock = vcdPriorityLock()
+        self._data_lock = threading.RLock()
+        self._single_flight = vcdSingleFlight()
+        # Raw bytes of the latest exchanges with vcontrold, for debugging
+        self.transcript = vcdTranscript()
+        self.__transcript_file = None
         self._connect()
 
         # Load config
-        project_path = pathlib.Path(sys.modules['__main__'].__file__).parent.resolve()
-        self.config_manager = vcdConfig(file=str((project_path / "vcontrold_config.yml")))
+        if config_file is None:
+            main_file = getattr(sys.modules['__main__'], '__file__', None)
+            project_path = pathlib.Path(main_file).parent.resolve() if main_file is not None else pathlib.Path.cwd()
+            config_file = str((project_path / "vcontrold_config.yml"))
+        self.config_manager = vcdConfig(file=config_file)
         self.config = self.config_manager.get_config()
-
-        # Heating control system initialization
-        self.__device_id = None
-        self._identify_heating_control()
+        self.__auto_reload_config = True
 
         # Return data
-        self.viessmann_data = dict(
-            meta=dict(),
-            data=dict()
-        )
+        self.__last_results = vcdResultSet([], 0.0, time.time())
+        self.__latest_results = {}
+        self.__history = collections.deque(maxlen=0)
+        self.__subscribers = []
         self.__output_format = "json"
         self.__switch_as_bool = True
         self.__exclude_timers = False
@@ -71,8 +130,42 @@ class vcontrold:
         self.__csv_linebreak = "\n"
         self.__csv_single_quotes = False
 
-        # Exit handler
-        atexit.register(self._exit_handler)
+        # Measured command latencies in seconds, used to plan sweeps with a deadline
+        self.__command_latency = {}
+
+        # Derived metrics of the configuration file, updated by each read
+        self.metrics = vcdMetrics(self.config.get('derived_metrics'))
+        for name, error in self.metrics.errors.items():
+            print(f"Derived metric {name} is invalid and ignored: {error}")
+
+        # Running statistics of the numeric values of each command
+        self.__statistics = {}
+        self.__include_statistics = False
+
+        # Skips failing commands until they are re-probed
+        self.circuit_breaker = vcdCircuitBreaker()
+
+        # Aborts stalled sweeps
+        self.watchdog = vcdWatchdog()
+        self.__reconnect_on_stall = True
+        self.__stalled = False
+
+        # Heating control system initialization
+        self.__device_id = None
+        self._identify_heating_control()
+        # Only keep the commands of the identified device
+        self._catalog = load_catalog(self.config_manager.config_file, self.config, self.__device_id)
+        self._load_capabilities()
+
+        # Restore the latest results of the previous run
+        self.__snapshot = None if snapshot_file is None else vcdSnapshot(snapshot_file)
+        self.__snapshot_interval = 300
+        self.__warm_start = False
+        self._load_snapshot()
+
+        # Closed at exit, if not closed before
+        self.__closed = False
+        _open_instances.add(self)
 
     @property
     def device_model(self) -> str:
@@ -136,7 +229,7 @@ class vcontrold:
 
         Args:
             fmt (str, optional): Output format. Defaults to `json`.
-                Supported formats: `json`, `dict`, `csv`
+                Supported formats: `json`, `dict`, `csv`, `results`
 
         Returns:
             str: The current output format.
@@ -151,13 +244,16 @@ class vcontrold:
 
         .. versionadded:: 2.0.0
             Replaced the previous method ``set_output_format``
+
+        .. versionchanged:: 2.1.0
+            Added the format `results`, which returns the :py:class:`vcdResultSet` of the sweep
         """
         return self.__output_format
 
     @output_format.setter
     def output_format(self, fmt: str):
         fmt = fmt.lower()
-        valid_formats = ['json', 'dict', 'csv']
+        valid_formats = ['json', 'dict', 'csv', 'results']
 
         if fmt in valid_formats:
             self.__output_format = fmt
@@ -248,39 +344,464 @@ class vcontrold:
     def csv_linebreak(self, linebreak: str) -> None:
         self.__csv_linebreak = linebreak
 
-    def _exit_handler(self):
-        """Exit handler is used, to reliably execute methods, when the Instance is exited"""
+    @property
+    def command_latencies(self) -> dict:
+        """:obj:`dict`: Measured latencies of the executed commands in seconds.
+
+        The latencies are measured by each executed command and are smoothed by a moving average. They are
+        used by :py:meth:`get_viessmann_data` to plan which commands fit into a given ``deadline``.
+
+        Returns:
+            dict: Command names as keys, with the expected execution time in seconds as value.
+
+        .. versionadded:: 2.1.0
+        """
+        return dict(self.__command_latency)
+
+    @property
+    def command_states(self) -> dict:
+        """:obj:`dict`: The commands, which are currently skipped because they failed.
+
+        A command, which fails with ``NOT OK`` or ``command unknown``, is counted by :py:attr:`circuit_breaker`, an
+        instance of :py:class:`vcdCircuitBreaker`. After repeated failures the command is skipped and re-probed on
+        an exponential backoff schedule, until it succeeds again. To disable a command permanently, set its
+        ``status`` to ``disabled`` in the configuration file.
+
+        Returns:
+            dict: Command names as keys, with dicts of the items ``state``, ``failures`` and ``retry_in`` as value.
+
+        .. versionadded:: 2.1.0
+        """
+        return self.circuit_breaker.states()
+
+    @property
+    def transcript_file(self) -> Optional[str]:
+        """:obj:`str`: File, to which the transcript is appended, if an exception occurs during an exchange.
+
+        The raw bytes of the latest exchanges with vcontrold are always recorded in :py:attr:`transcript`, a
+        preallocated ring buffer, which can be dumped on demand with :py:meth:`dump_transcript`.
+
+        Args:
+            file (str): Path of the file. Defaults to ``None``, which disables automatic dumps.
+
+        Returns:
+            :obj:`str`: The current setting.
+
+        .. versionadded:: 2.1.0
+        """
+        return self.__transcript_file
+
+    @transcript_file.setter
+    def transcript_file(self, file: Optional[str]):
+        self.__transcript_file = file
+
+    def dump_transcript(self, file: str = None) -> str:
+        """Returns the recorded transcript of the latest exchanges with vcontrold.
+
+        Args:
+            file (str): Appends the transcript to this file, if given. Defaults to ``None``.
+
+        Returns:
+            str: The transcript, one line per sent or received packet.
+
+        Example:
+            >>> vcd.dump_transcript()
+               -0.052113 << b'vctrld>'
+               -0.052050 >> b'getTempA\\n'
+               -0.011871 << b'6.80000 Grad Celsius\\n'
+
+        .. versionadded:: 2.1.0
+        """
+        transcript = self.transcript.format()
+        if file is not None:
+            with open(file, "a") as outfile:
+                outfile.write(f"--- {datetime.datetime.now().isoformat()} {self.__host}:{self.__port}\n")
+                outfile.write(transcript + "\n")
+
+        return transcript
+
+    @property
+    def reconnect_on_stall(self) -> bool:
+        """:obj:`bool`: Controls whether the connection is re-established before the next sweep, after a sweep stalled.
+
+        Sweeps of :py:meth:`get_viessmann_data` are monitored by :py:attr:`watchdog`, an instance of
+        :py:class:`vcdWatchdog`. If it detects consecutive timeouts or a collapse of the throughput, the sweep is
+        aborted and returns the results collected so far, with ``status: stalled`` and the ``stall_reason`` in the
+        meta data. Set :py:attr:`watchdog` to ``None`` to disable the monitoring.
+
+        Args:
+            reconnect (bool): Defaults to ``True``.
+
+        Returns:
+            :obj:`bool`: The current setting.
+
+        .. versionadded:: 2.1.0
+        """
+        return self.__reconnect_on_stall
+
+    @reconnect_on_stall.setter
+    def reconnect_on_stall(self, reconnect: bool):
+        self.__reconnect_on_stall = reconnect
+
+    @property
+    def catalog(self) -> vcdCatalog:
+        """:obj:`vcdCatalog`: The compiled commands of the identified device.
+
+        The catalog is replaced, when the configuration is reloaded. Keep a reference for a consistent view over
+        multiple lookups.
+
+        .. versionadded:: 2.1.0
+        """
+        return self._catalog
+
+    @property
+    def viessmann_data(self) -> dict:
+        """:obj:`dict`: The data of the latest call of :py:meth:`get_viessmann_data` with the items ``meta`` and ``data``.
+
+        .. versionchanged:: 2.1.0
+            Contains only the results of the latest sweep, instead of all results collected by the instance
+        """
+        return self.__last_results.as_dict(self.__exclude_timers)
+
+    @property
+    def last_results(self) -> vcdResultSet:
+        """:obj:`vcdResultSet`: The results of the latest call of :py:meth:`get_viessmann_data`.
+
+        .. versionadded:: 2.1.0
+        """
+        return self.__last_results
+
+    @property
+    def latest_results(self) -> dict:
+        """:obj:`dict`: The latest :py:class:`vcdResult` of each command, executed by the instance.
+
+        Includes the ``stale`` results, which were restored from the ``snapshot_file``.
+
+        .. versionadded:: 2.1.0
+        """
+        with self._data_lock:
+            return dict(self.__latest_results)
+
+    @property
+    def derived_metrics(self) -> dict:
+        """:obj:`dict`: Current values of the derived metrics, defined in the section ``derived_metrics`` of the
+        configuration file.
+
+        The metrics are updated incrementally by each read, so they don't need to re-scan the :py:attr:`history`.
+        They are included as ``derived`` in the output of :py:meth:`get_viessmann_data`. See :py:class:`vcdMetrics`
+        for the definition of metrics.
+
+        Returns:
+            dict: Metric names as keys, with dicts of the items ``value``, ``unit`` and ``description`` as value.
+
+        .. versionadded:: 2.1.0
+        """
+        with self._data_lock:
+            return self.metrics.values()
+
+    @property
+    def statistics(self) -> dict:
+        """:obj:`dict`: Running statistics of the numeric values of each command, read by the instance.
+
+        The statistics are updated with each successful read in constant memory, without keeping the values. See
+        :py:class:`vcdStatistics` for the contained items.
+
+        Returns:
+            dict: Command names as keys, with the statistics as dict.
+
+        .. versionadded:: 2.1.0
+        """
+        with self._data_lock:
+            return {command: statistics.as_dict() for command, statistics in self.__statistics.items()}
+
+    def get_statistics(self, command: str) -> Optional[dict]:
+        """Returns the running statistics of a command.
+
+        Args:
+            command (str): Name of the command.
+
+        Returns:
+            dict: The statistics, see :py:meth:`vcdStatistics.as_dict`. ``None``, if no numeric value was read yet.
+
+        .. versionadded:: 2.1.0
+        """
+        with self._data_lock:
+            statistics = self.__statistics.get(command)
+            return None if statistics is None else statistics.as_dict()
+
+    @property
+    def include_statistics(self) -> bool:
+        """:obj:`bool`: Controls whether the output of :py:meth:`get_viessmann_data` contains the running statistics
+        of the executed commands as ``statistics`` in the meta data.
+
+        Args:
+            include (bool): Defaults to ``False``.
+
+        Returns:
+            :obj:`bool`: The current setting.
+
+        .. versionadded:: 2.1.0
+        """
+        return self.__include_statistics
+
+    @include_statistics.setter
+    def include_statistics(self, include: bool):
+        self.__include_statistics = include
+
+    @property
+    def snapshot_interval(self) -> float:
+        """:obj:`float`: Min number of seconds between two snapshots, written after a sweep.
+
+        Requires a ``snapshot_file``. Results, which were restored from the snapshot at startup, are marked as
+        ``stale`` in :py:attr:`latest_results`, until they are replaced by a successful read.
+
+        Args:
+            interval (float): Defaults to ``300``. ``0`` writes a snapshot after each sweep.
+
+        Returns:
+            :obj:`float`: The current setting.
+
+        .. versionadded:: 2.1.0
+        """
+        return self.__snapshot_interval
+
+    @snapshot_interval.setter
+    def snapshot_interval(self, interval: float):
+        self.__snapshot_interval = interval
+
+    @property
+    def history_size(self) -> int:
+        """:obj:`int`: Number of sweeps, which are kept in :py:attr:`history`.
+
+        Args:
+            size (int): Defaults to ``0``, which disables the history.
+
+        Returns:
+            :obj:`int`: The current setting.
+
+        .. versionadded:: 2.1.0
+        """
+        return self.__history.maxlen
+
+    @history_size.setter
+    def history_size(self, size: int):
+        with self._data_lock:
+            self.__history = collections.deque(self.__history, maxlen=size)
+
+    @property
+    def history(self) -> list:
+        """:obj:`list`: The :py:class:`vcdResultSet` of the latest sweeps, oldest first.
+
+        .. versionadded:: 2.1.0
+        """
+        with self._data_lock:
+            return list(self.__history)
+
+    def subscribe(self, callback) -> None:
+        """Registers a callback, which is called with the :py:class:`vcdResultSet` of each completed sweep.
+
+        Callbacks are executed within the thread, which called :py:meth:`get_viessmann_data`, so they should
+        return quickly.
+
+        Args:
+            callback (callable): Function, which accepts a :py:class:`vcdResultSet`.
+
+        .. versionadded:: 2.1.0
+        """
+        with self._data_lock:
+            self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Removes a callback, which was registered with :py:meth:`subscribe`.
+
+        .. versionadded:: 2.1.0
+        """
+        with self._data_lock:
+            if callback in self.__subscribers:
+                self.__subscribers.remove(callback)
+
+    def _notify_subscribers(self, result_set: vcdResultSet):
+        """Passes a completed sweep to all subscribers."""
+        with self._data_lock:
+            subscribers = list(self.__subscribers)
+        for callback in subscribers:
+            callback(result_set)
+
+    def export_numpy(self, commands: list = None, step: float = None):
+        """Exports the collected :py:attr:`history` as NumPy array.
+
+        Requires NumPy, which can be installed with ``pip install pyvcontrold-net[numpy]``. Use the functions of
+        :py:mod:`vcontrold.numpy_export` for vectorized conversions of the exported array.
+
+        Args:
+            commands (list): Commands to export. Defaults to ``None``, which exports all numeric commands.
+            step (float): Resamples the array onto a regular grid with this step in seconds. Defaults to ``None``.
+
+        Returns:
+            numpy.ndarray: Structured array with the column ``timestamp`` and one float column per command.
+            Missing or failed reads are NaN.
+
+        Example:
+            >>> vcd = vcontrold(host="127.0.0.1", port=3002)
+            >>> vcd.history_size = 1440
+            >>> vcd.get_viessmann_data()
+            >>> vcd.export_numpy(['getTempA', 'getTempWWist'])
+
+        .. versionadded:: 2.1.0
+        """
+        from . import numpy_export
+
+        array = numpy_export.to_array(self.history, commands)
+        if step is not None:
+            array = numpy_export.resample(array, step)
+
+        return array
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Closes the connection to vcontrold and writes the configuration, if it was changed.
+
+        Example:
+            >>> with vcontrold(host="127.0.0.1", port=3002) as vcd:
+            ...     vcd.get_viessmann_data()
+
+        .. versionadded:: 2.1.0
+            Replaces the exit handler, which was registered for each instance
+        """
+        if self.__closed is True:
+            return
+        self.__closed = True
+        _open_instances.discard(self)
         self._save_config()
+        self.save_snapshot()
         self._close()
 
+    @property
+    def auto_reload_config(self) -> bool:
+        """:obj:`bool`: Controls whether changes of the configuration file are applied before each sweep.
+
+        See :py:meth:`reload_config`.
+
+        Args:
+            reload (bool): Defaults to ``True``.
+
+        Returns:
+            :obj:`bool`: The current setting.
+
+        .. versionadded:: 2.1.0
+        """
+        return self.__auto_reload_config
+
+    @auto_reload_config.setter
+    def auto_reload_config(self, reload: bool):
+        self.__auto_reload_config = reload
+
+    def reload_config(self) -> bool:
+        """Applies changes of the configuration file, while the connection stays open.
+
+        Only the modification time of the file is checked, so calling the method is cheap, if nothing changed. The
+        commands of the identified device are compiled again, whereby the records of unchanged commands are reused.
+        The derived metrics are only rebuilt, if their definitions changed. Measured latencies, the capability cache
+        and the statistics are kept.
+
+        Returns:
+            bool: ``True``, if a changed configuration was applied.
+
+        .. versionadded:: 2.1.0
+        """
+        if self.config_manager.changed() is False:
+            return False
+
+        config = self.config_manager.reload()
+        if config is None:
+            return False
+
+        catalog = load_catalog(self.config_manager.config_file, config, self.__device_id, previous=self._catalog)
+        metrics = None
+        if config.get('derived_metrics') != self.config.get('derived_metrics'):
+            metrics = vcdMetrics(config.get('derived_metrics'))
+            for name, error in metrics.errors.items():
+                print(f"Derived metric {name} is invalid and ignored: {error}")
+
+        with self._data_lock:
+            self.config = config
+            self._catalog = catalog
+            if metrics is not None:
+                self.metrics = metrics
+
+        if self.__log_info is True:
+            print(f"Reloaded the changed config at path {self.config_manager.config_file} ({len(catalog)} commands).")
+        return True
+
+    def save_snapshot(self) -> None:
+        """Writes the latest result of each command to the snapshot file.
+
+        Called automatically after a sweep, once :py:attr:`snapshot_interval` passed since the last snapshot, and at
+        :py:meth:`close`. Does nothing, if the instance was created without ``snapshot_file``.
+
+        .. versionadded:: 2.1.0
+        """
+        if self.__snapshot is None:
+            return
+
+        with self._data_lock:
+            results = list(self.__latest_results.values())
+        self.__snapshot.save(results)
+
+    def _load_snapshot(self):
+        """Restores the results of the snapshot file, marked as stale, as latest results."""
+        if self.__snapshot is None:
+            return
+
+        restored = 0
+        with self._data_lock:
+            for result in self.__snapshot.load():
+                vcd_command = self._catalog.commands.get(result.command)
+                if vcd_command is None:
+                    continue
+                self.__latest_results[result.command] = result.replace(description=vcd_command.description)
+                restored += 1
+
+        # The first sweep reads the commands in order of priority, to replace the most important stale values first
+        self.__warm_start = restored > 0
+        if self.__log_info is True:
+            print(f"Restored {restored} stale results from the snapshot {self.__snapshot.file}.")
+
     def _save_config(self):
         """Used to save the potentially modified configuration."""
-        self.config_manager.write_config(self.config)
+        self.config_manager.flush()
 
     def _connect(self):
         """Connects to vcontrold"""
-        self._sock = socket.socket()
-        self._sock.settimeout(self.__timeout)
-        self._sock.connect((self.__host, self.__port))
+        self._transport.connect()
 
     def _close(self):
         """Closes connection to vcontrold"""
-        self._sock.close()
-
-    def _disable_command(self, command: str):
-        """Disables a specific command in configuration file.
-
-        Args:
-            command (str): Command, which should be disabled.
-        """
-        self.config['vcontrold_commands']['get'][command]['status'] = "disabled"
-
-    def _sanitize_data_value(self, command: str, value: str):
+        self._transport.close()
+
+    def _reconnect(self):
+        """Replaces the connection to vcontrold, e.g. after a timeout left it in an unknown state."""
+        with self._sock_lock:
+            self._close()
+            self.__prompt_received = False
+            # Stays stale, if the connection can't be re-established, so the next command retries
+            self.__connection_stale = True
+            self._connect()
+            self.__connection_stale = False
+
+    def _sanitize_data_value(self, command: str, value: str, catalog: vcdCatalog = None):
         """Method so sanitize returned values from vcontrold.
 
         Args:
             command (str): Command, from which the value was returned.
             value (str): The value returned from vcontrold.
+            catalog (vcdCatalog): Catalog, or dict of :py:class:`vcdCommand` records, which contains the command.
+                Defaults to the current catalog.
 
         Returns:
             (tuple): Tuple containing:
@@ -290,95 +811,16 @@ class vcontrold:
         .. versionchanged:: 2.0.0
             Fixed temperature return values, that contain the string *Grad Celsius*
             Added conversion to Fahrenheit
+
+        .. versionchanged:: 2.1.0
+            The parser is selected once per command, when the configuration is compiled
         """
         # Remove trailing linebreaks and whitespaces
         value = value.rstrip("\n").strip()
 
         # Sanitize, based on unit
-        command_unit = self.config['vcontrold_commands']['get'][command]['unit']
-
-        if command_unit.lower() == "error":
-            error = value.split(" ", 1)
-            error_date = error[0]
-            error_msg = error[1]
-            dt = datetime.datetime.strptime(error_date, "%Y-%m-%dT%H:%M:%S%z")
-
-            return dict(
-                parsed={'date': dt.strftime('%Y-%m-%d'), 'time': dt.strftime('%H:%M:%S'), 'errorMessage': error_msg},
-                original=value
-            ), None
-            # return f"{dt.strftime('%Y-%m-%d - %H:%M:%S')}: {error_msg}"
-        if command_unit.lower() == "hours":
-            value = round(float(value), 2)
-            return value, command_unit.lower()
-        if command_unit.lower() == "none":
-            return value, None
-        if command_unit.lower() == "number":
-            value = round(float(value), 2)
-            return value, command_unit.lower()
-        if command_unit.lower() == "percent":
-            value = round(float(value), 2)
-            return value, "%"
-        if command_unit.lower() == "power":
-            value = round(float(value), 2)
-            return value, "W"
-        if command_unit.lower() == "shift":
-            value = round(float(value), 2)
-            return value, "shift"
-        if command_unit.lower() == "slope":
-            value = round(float(value), 2)
-            return value, "slope"
-        if command_unit.lower() == "switch":
-            if self.__switch_as_bool is True:
-                return True if int(value) == 1 else False, "bool"
-            else:
-                return "on" if int(value) == 1 else "off", "bool"
-        if command_unit.lower() == "temperature":
-            value = value.replace("Grad Celsius", "").strip()
-
-            if self.__use_fahrenheit is True:
-                value = float(value)
-                value = (value * 1.8) + 32
-                value = round(float(value), 2)
-                unit = "F"
-            else:
-                value = round(float(value), 2)
-                unit = "C"
-
-            return value, unit
-
-        if command_unit.lower() == "text":
-            return value, "str"
-        if command_unit.lower() == "time":
-            dt = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
-            return dt.strftime('%Y-%m-%d - %H:%M:%S'), "datetime"
-        if command_unit.lower() == "timer":
-            timetable = value.split("\n")
-            timetable_entries_sanitized = []
-            for time_entry in timetable:
-                # Remove leading and trailing whitespaces
-                time_entry = time_entry.strip()
-                # Remote multiple whitespaces within the string
-                time_entry = " ".join(time_entry.split())
-                # Split by remaining white - results in on and off entry
-                time_entry = time_entry.split(" ")
-                # Split at first colon to get index
-                time_entry_a = time_entry[0].split(":", 1)
-                time_entry_index = time_entry_a[0]
-                # Split again at first colon and use index 1, to get the actual value
-                # Example: "An:05:00" -> time_entry_a[1].split(":", 1)[1] -> "05:00"
-                time_entry_on = time_entry_a[1].split(":", 1)[1]
-                time_entry_off = time_entry[1].split(":", 1)[1]
-
-                timetable_entries_sanitized.append({
-                    'index': time_entry_index,
-                    'on': time_entry_on if time_entry_on != "--" else None,
-                    'off': time_entry_off if time_entry_off != "--" else None
-                })
-            # return ';'.join(timetable_entries_sanitized)
-            return dict(parsed=timetable_entries_sanitized, original=timetable), "timetable"
-
-        return value, None
+        catalog = self._catalog if catalog is None else catalog
+        return catalog[command].parser(value, self.__switch_as_bool, self.__use_fahrenheit)
 
     def _identify_heating_control(self):
         """Used to identify the heating control system.
@@ -389,10 +831,12 @@ class vcontrold:
         max_loop_count = 3
         loop_count = 1
 
+        # Only the identification command is compiled, the catalog is compiled for the identified device afterwards
+        params = self.config['vcontrold_commands']['get'].get('getDevType') or {}
+        commands = {'getDevType': vcdCommand('getDevType', params)}
+
         while loop_count < max_loop_count:
-            self._read_prompt()
-            self._sock.send('getDevType\n'.encode())
-            hcs, unit = self._sanitize_data_value('getDevType', self._sock.recv(1000).decode('utf-8'))
+            hcs, unit = self._sanitize_data_value('getDevType', self._exchange('getDevType'), commands)
 
             if hcs is not None and 'ID=' in hcs and 'Protokoll:' in hcs:
                 device_model, device_id, device_protocol = hcs.split(" ")
@@ -418,76 +862,384 @@ class vcontrold:
         Returns:
             bool: Returns True, if the received data matches the expected string. Otherwise False is returned.
         """
-        data = self._sock.recv(1000)
-        if data.decode('utf-8') != 'vctrld>':
+        if self.__prompt_received is True:
+            # The prompt was already received together with the previous response
+            self.__prompt_received = False
+            return True
+
+        data = self._transport.recv(1000)
+        self.transcript.record(RECEIVED, data)
+        if data.decode('utf-8') != PROMPT:
             if self.__log_info is True:
                 print(f"Returned data is unexpected. Prompt 'vctrld>' expected, but received '{data}'")
             return False
 
         return True
 
-    def _read(self, command: str):
+    def _recv_response(self) -> str:
+        """Receives the response of an executed command.
+
+        If vcontrold sends the next prompt within the same packet as the response, the prompt is stripped and
+        remembered, so :py:meth:`_read_prompt` doesn't wait for it again.
+
+        Returns:
+            str: The response of vcontrold without the trailing prompt.
+        """
+        data = self._transport.recv(1000)
+        self.transcript.record(RECEIVED, data)
+        data = data.decode('utf-8')
+        if data.endswith(PROMPT) and data != PROMPT:
+            self.__prompt_received = True
+            data = data[:-len(PROMPT)]
+
+        return data
+
+    def _exchange(self, command: str, lane: int = INTERACTIVE) -> str:
+        """Sends a command to vcontrold and returns the raw response.
+
+        The connection is locked during the exchange, so commands of concurrent threads don't interleave.
+        After a timeout, the connection is re-established before the next command is sent.
+
+        Args:
+            command (str): The command to be executed against vcontrold.
+            lane (int): Lane, in which the connection is awaited. ``INTERACTIVE`` is served before ``BACKGROUND``.
+
+        Returns:
+            str: The raw response of vcontrold.
+
+        Raises:
+            socket.timeout: If vcontrold doesn't respond within the timeout.
+            OSError: If the connection failed or couldn't be re-established.
+        """
+        with self._sock_lock.lane(lane):
+            if self.__connection_stale is True:
+                self._reconnect()
+            try:
+                self._read_prompt()
+                data = f'{command}\n'.encode()
+                self.transcript.record(SENT, data)
+                self._transport.send(data)
+                return self._recv_response()
+            except Exception as e:
+                if isinstance(e, OSError):
+                    self.__connection_stale = True
+                if self.__transcript_file is not None:
+                    self.dump_transcript(self.__transcript_file)
+                raise
+
+    def _read(self, command: str, lane: int = INTERACTIVE, catalog: vcdCatalog = None):
         """Used to execute a specific command and process the returned data.
 
         This is basically the main method in the class.
 
         Args:
             command (str): The command to be executed against vcontrold.
+            lane (int): ``INTERACTIVE`` (default) reads are executed before the next command of a running sweep,
+                which reads in the ``BACKGROUND`` lane.
+            catalog (vcdCatalog): Catalog, which is used for the whole read, also if the configuration is reloaded
+                meanwhile. Defaults to the current catalog.
 
         Returns:
-            bool: Returns False, if the requested command is disabled, heating control system identification is not yet done or the command is not available for the specific heating control system. Returns True is everything works properly.
+            vcdResult: Returns None, if the requested command is disabled, heating control system identification is not yet done or the command is not available for the specific heating control system. Returns the result of the command otherwise.
 
+        .. versionchanged:: 2.1.0
+            Concurrent calls for the same command share a single execution.
+            Returns the :py:class:`vcdResult` instead of ``True`` and ``None`` instead of ``False``.
+            Failing commands are skipped by :py:attr:`circuit_breaker`, instead of being disabled in the configuration file.
+            Added the arguments ``lane`` and ``catalog``.
         """
-        time_start = time.time()
-        execute_command_state = "success"
-
-        if self.config['vcontrold_commands']['get'][command]['status'] == "disabled":
+        catalog = self._catalog if catalog is None else catalog
+        vcd_command = catalog.commands.get(command)
+        if vcd_command is None:
+            if self.__log_info is True:
+                print(f"Command {command} is not available for device ID {self.__device_id} and skipped.")
+            return None
+        elif vcd_command.status == "disabled":
             if self.__log_info is True:
                 print(f"Command {command} is disabled and skipped.")
-            return False
-        elif self.__device_id not in self.config['vcontrold_commands']['get'][command]['devices']:
+            return None
+        elif self._capabilities.supported(command) is False:
             if self.__log_info is True:
-                print(f"Command {command} is not available for device ID {self.__device_id} and skipped (available device IDs: {self.config['vcontrold_commands']['get'][command]['devices']}).")
-            return False
+                print(f"Command {command} is not supported by device ID {self.__device_id} according to the capability cache and skipped.")
+            return None
+        elif self.circuit_breaker.allow(command) is False:
+            if self.__log_info is True:
+                print(f"Command {command} failed repeatedly and is skipped until it is re-probed.")
+            return None
         else:
-            self._read_prompt()
-            self._sock.send(f'{command}\n'.encode())
-            data = self._sock.recv(1000).decode('utf-8')
+            return self._single_flight.do(command, lambda: self._execute(command, lane, catalog))
 
-            # print(f"{command}: {data}")
+    def _execute(self, command: str, lane: int, catalog: vcdCatalog) -> vcdResult:
+        """Executes a command, which passed the checks of :py:meth:`_read`, and processes the returned data.
+
+        Args:
+            command (str): The command to be executed against vcontrold.
+            lane (int): Lane, in which the connection is awaited.
+            catalog (vcdCatalog): Catalog, which contains the command.
 
-            if data is None or 'NOT OK' in data:
-                self._disable_command(command)
-                data = ""
-                execute_command_state = "failed"
-            elif "command unknown" in data:
+        Returns:
+            vcdResult: The result of the command.
+        """
+        # The time waiting for the connection doesn't count as latency of the command
+        with self._sock_lock.lane(lane):
+            time_start = time.time()
+            try:
+                data = self._exchange(command, lane)
+                execute_command_state = self._response_state(data)
+            except socket.timeout:
                 if self.__log_info is True:
-                    print(f"command {command} is unknown")
-                self._disable_command(command)
-                data = ""
-                execute_command_state = "failed"
-            elif "Wrong result, terminating" in data:
+                    print(f"{command}: No response within {self.__timeout} seconds.")
+                data = None
+                execute_command_state = "timeout"
+            except OSError as e:
+                # E.g. the connection was reset, or re-establishing it was refused. Counts as timeout, so the
+                # watchdog aborts the sweep and the results collected so far are kept.
                 if self.__log_info is True:
-                    print(f"{command}: Failed to execute temporarily. Please retry to get the value.")
-                data = ""
-                execute_command_state = "failed_temporarily"
+                    print(f"{command}: Connection to vcontrold failed: {e}")
+                data = None
+                execute_command_state = "timeout"
+
+        if execute_command_state == "failed":
+            if self.__log_info is True and data is not None and "command unknown" in data:
+                print(f"command {command} is unknown")
+            if self.circuit_breaker.record_failure(command) == "open" and self.__log_info is True:
+                print(f"{command}: Failed repeatedly and is skipped until it is re-probed.")
+        elif execute_command_state == "failed_temporarily":
+            if self.__log_info is True:
+                print(f"{command}: Failed to execute temporarily. Please retry to get the value.")
+        elif execute_command_state == "success":
+            self.circuit_breaker.record_success(command)
+
+        if execute_command_state == "success":
+            data, unit = self._sanitize_data_value(command, data, catalog)
+        else:
+            data, unit = None, None
+
+        time_end = time.time()
+        if execute_command_state != "timeout":
+            self._record_latency(command, time_end - time_start)
+
+        result = vcdResult(command, data, unit, execute_command_state, time_end - time_start, time_end,
+                           catalog[command].description)
+        with self._data_lock:
+            latest = self.__latest_results.get(command)
+            # Keep serving a restored value, until the command is read successfully
+            if latest is None or latest.stale is False or execute_command_state == "success":
+                self.__latest_results[command] = result
+            self.metrics.update(result)
+            if execute_command_state == "success":
+                value = numeric_value(data)
+                if value is not None:
+                    statistics = self.__statistics.get(command)
+                    if statistics is None:
+                        statistics = self.__statistics[command] = vcdStatistics()
+                    statistics.update(time_end, value)
+
+        return result
+
+    @staticmethod
+    def _response_state(data: str) -> str:
+        """Classifies the raw response of vcontrold.
 
-            data, unit = self._sanitize_data_value(command, data)
+        Args:
+            data (str): The raw response.
 
-            time_end = time.time()
-            duration = round(time_end - time_start, 3)
+        Returns:
+            str: ``failed`` for unknown or unsupported commands, ``failed_temporarily`` if the command may succeed,
+            when it's executed again, ``success`` otherwise.
+        """
+        if data is None or 'NOT OK' in data or "command unknown" in data:
+            return "failed"
+        if "Wrong result, terminating" in data:
+            return "failed_temporarily"
+        return "success"
+
+    def _load_capabilities(self):
+        """Loads the capability cache of the identified device and takes over its measured latencies."""
+        if self.__device_id is None:
+            # Without identification there is no cache to load, and none to create
+            self._capabilities = vcdCapabilities(None, None)
+            return
+
+        self._capabilities = vcdCapabilities.for_config(self.config_manager.config_file, self.__device_id)
+        with self._data_lock:
+            for command, latency in self._capabilities.latencies().items():
+                self.__command_latency.setdefault(command, latency)
+
+    def probe_capabilities(self) -> dict:
+        """Probes which commands are supported by the connected heating control system.
+
+        Every command of the configuration file is executed once, regardless of its ``status`` and ``devices``.
+        Commands, which are answered with ``NOT OK``, ``command unknown`` or not at all within the timeout, are
+        recorded as unsupported. The result and the measured latency of each command are stored in the capability
+        cache ``vcontrold_capabilities_<device_id>.yml`` next to the configuration file. Afterwards, unsupported
+        commands are skipped by :py:meth:`get_viessmann_data`, before they are sent to vcontrold.
 
-            return_data = {}
-            return_data.update({command: {}})
-            return_data[command].update({'value': data})
-            return_data[command].update({'unit': unit})
-            return_data[command].update({'description': self.config['vcontrold_commands']['get'][command]['description']})
-            return_data[command].update({'state': execute_command_state})
-            if self.exclude_timers is not True:
-                return_data[command].update({'execution_time': f'{duration} seconds'})
-            self.viessmann_data['data'].update(return_data)
+        Note:
+            Probing executes all commands, so it takes several minutes. It only needs to be repeated, if the
+            heating control system or the configuration file changed.
 
-            return True
+        Returns:
+            dict: Command names as keys, with dicts containing ``supported`` and ``latency`` as values. Empty, if
+            the heating control system wasn't identified.
+
+        .. versionadded:: 2.1.0
+        """
+        if self.__device_id is None:
+            if self.__log_info is True:
+                print("The heating control system wasn't identified, so its capabilities aren't probed.")
+            return {}
+
+        capabilities = vcdCapabilities(self._capabilities.file, self.__device_id)
+
+        # Probe all commands of the configuration file, not only the ones assigned to the device. Only their names
+        # are needed, so they aren't compiled.
+        for command in self.config['vcontrold_commands']['get']:
+            if self.__log_info is True:
+                sys.stdout.write(f"\rProbing command {command:s}...")
+                sys.stdout.flush()
+
+            time_start = time.time()
+            try:
+                supported = self._response_state(self._exchange(command, BACKGROUND)) != "failed"
+            except socket.timeout:
+                supported = False
+            latency = time.time() - time_start
+
+            capabilities.record(command, supported, latency)
+            if supported is True:
+                self._record_latency(command, latency)
+
+        if self.__log_info is True:
+            print("")
+
+        capabilities.save()
+        self._capabilities = capabilities
+
+        return dict(capabilities.commands)
+
+    def _record_latency(self, command: str, latency: float):
+        """Updates the moving average of the latency of a command.
+
+        Args:
+            command (str): The executed command.
+            latency (float): The measured execution time in seconds.
+        """
+        with self._data_lock:
+            previous = self.__command_latency.get(command)
+            if previous is None:
+                self.__command_latency[command] = latency
+            else:
+                self.__command_latency[command] = previous + LATENCY_SMOOTHING * (latency - previous)
+
+    def _expected_latency(self, command: str) -> float:
+        """Returns the expected execution time of a command in seconds.
+
+        Commands without a measured latency are expected to take as long as the average of the measured commands.
+        """
+        latency = self.__command_latency.get(command)
+        if latency is None:
+            if len(self.__command_latency) > 0:
+                return sum(self.__command_latency.values()) / len(self.__command_latency)
+            return DEFAULT_COMMAND_LATENCY
+        return latency
+
+    def _plan_sweep(self, commands: list, deadline: float, catalog: vcdCatalog) -> tuple:
+        """Selects and orders the commands, which fit into the given time budget.
+
+        Commands are picked greedily by their priority per expected second of execution time, until the budget
+        is exhausted. The picked commands are ordered by their priority, so the most important values are read
+        first.
+
+        Args:
+            commands (list): The commands, which should be executed.
+            deadline (float): Time budget in seconds.
+            catalog (vcdCatalog): Catalog, which contains the commands.
+
+        Returns:
+            (tuple): Tuple containing:
+                planned (list): The commands to execute, ordered by priority.
+                skipped (list): The commands, which don't fit into the time budget, in no particular order.
+        """
+        def priority(command):
+            return catalog[command].priority
+
+        def efficiency(command):
+            return priority(command) / max(self._expected_latency(command), 0.001)
+
+        planned = []
+        skipped = []
+        budget = deadline
+        for command in sorted(commands, key=efficiency, reverse=True):
+            latency = self._expected_latency(command)
+            if latency <= budget:
+                planned.append(command)
+                budget -= latency
+            else:
+                skipped.append(command)
+
+        planned.sort(key=priority, reverse=True)
+
+        return planned, skipped
+
+    def get_value(self, command: str) -> Optional[vcdResult]:
+        """Reads a single command.
+
+        The command is executed directly, before the next command of a running sweep. Neither a sweep, nor the JSON
+        document of :py:meth:`get_viessmann_data` is built, so the call only costs the round trip to vcontrold.
+
+        Example:
+            >>> result = vcd.get_value('getTempWWist')
+            >>> result.value, result.unit
+            (48.2, 'C')
+
+        Args:
+            command (str): The command to be executed against vcontrold.
+
+        Returns:
+            vcdResult: The sanitized value, unit, state and timestamp of the read. ``None``, if the command is
+            disabled, skipped or not available for the heating control system.
+
+        .. versionadded:: 2.1.0
+        """
+        return self._read(command)
+
+    def get_values(self, commands: list) -> dict:
+        """Reads multiple commands, like :py:meth:`get_value`.
+
+        Args:
+            commands (list): The commands to be executed against vcontrold.
+
+        Returns:
+            dict: Command names as keys, with the :py:class:`vcdResult` or ``None`` as value.
+
+        .. versionadded:: 2.1.0
+        """
+        return {command: self._read(command) for command in commands}
+
+    def set_command_status(self, command: str, enabled: bool) -> None:
+        """Enables or disables a command and saves it in the configuration file.
+
+        The change applies to the next read. The configuration file is written debounced, see :py:class:`vcdConfig`,
+        and at the latest by :py:meth:`close`.
+
+        Example:
+            >>> vcd.set_command_status('getSolarStunden', enabled=False)
+
+        Args:
+            command (str): Name of the command.
+            enabled (bool): ``True`` to enable, ``False`` to disable the command.
+
+        Raises:
+            ValueError: If the command isn't defined in the configuration file.
+
+        .. versionadded:: 2.1.0
+        """
+        self.config_manager.update_command(command, {'status': 'enabled' if enabled is True else 'disabled'})
+        # The file isn't written yet, so the shared catalog of the file can't be used
+        catalog = vcdCatalog(self.config, self.__device_id, previous=self._catalog)
+        with self._data_lock:
+            self._catalog = catalog
 
     def get_units(self) -> list:
         """:obj:`list`: Get the units, configured in the configuration file.
@@ -506,12 +1258,7 @@ class vcontrold:
             >>> vcd.get_units()
             ['error', 'hours', 'none', 'number', 'percent', 'power', 'shift', 'slope', 'switch', 'temperature', 'text', 'time', 'timer']
         """
-        command_units = []
-        for command, params in self.config["vcontrold_commands"]['get'].items():
-            if type(params['unit']) == str and params['unit'] not in command_units:
-                command_units.append(params['unit'])
-
-        return sorted(command_units)
+        return list(self._catalog.units)
 
     def get_groups(self) -> list:
         """:obj:`list`: Get the groups, configured in the configuration file.
@@ -532,15 +1279,7 @@ class vcontrold:
             ['burner', 'environment', 'error', 'mixer', 'operation-mode', 'power', 'pumps', 'solar', 'stats', 'system', 'temperature', 'timer']
 
         """
-
-        device_groups = []
-        for command, params in self.config["vcontrold_commands"]['get'].items():
-            if type(params['groups']) == list and len(params['groups']) > 0:
-                for group in params['groups']:
-                    if type(group) == str and group not in device_groups:
-                        device_groups.append(group)
-
-        return sorted(device_groups)
+        return list(self._catalog.groups)
 
     def get_items_per_group(self) -> dict:
         """:obj:`dict`: Get the groups with all assigned commands.
@@ -582,9 +1321,9 @@ class vcontrold:
         for group in device_groups:
             device_group_items.update({group: {'num_items': 0, 'items': []}})
 
-            for command, params in self.config["vcontrold_commands"]['get'].items():
-                if group in params['groups']:
-                    device_group_items[group]['items'].append(command)
+            for vcd_command in self._catalog:
+                if group in vcd_command.groups:
+                    device_group_items[group]['items'].append(vcd_command.name)
                     device_group_items[group]['num_items'] += 1
 
         return json.dumps(device_group_items, indent=4)
@@ -603,6 +1342,9 @@ class vcontrold:
             recommend to always use the :obj:`str` type, as the single group selector may be removed
             in future versions.
 
+        Instead of a group name, a group expression can be used, e.g. ``temperature & mixer`` or
+        ``* & !error & !timer``. See :py:meth:`query`.
+
         Args:
             group (:obj:`str` or :obj:`list`): Group to filter commands. Defaults to ``None``.
 
@@ -611,6 +1353,9 @@ class vcontrold:
 
         .. versionadded:: 2.0.0
             Replaces previous method ``set_group``. Accepts ``list`` instead of only a single group name. Returns always `list`, if defined.
+
+        .. versionchanged:: 2.1.0
+            Accepts group expressions.
         """
         return self.__filter_group
 
@@ -620,13 +1365,13 @@ class vcontrold:
         if type(groups) == str:
             groups = [groups]
 
-        existing_groups = self.get_groups()
         new_groups = []
         for group in groups:
-            if group in existing_groups:
+            try:
+                self._catalog.mask(group)
                 new_groups.append(group)
-            else:
-                print(f"Requested group {group} is not yet configured. If you want to use this group, you need to define it in the configuration file.")
+            except ValueError as e:
+                print(f"Requested group {group} is not yet configured. If you want to use this group, you need to define it in the configuration file. ({e})")
 
         if len(new_groups) > 0:
             self.__filter_group = new_groups
@@ -638,7 +1383,7 @@ class vcontrold:
         """
         self.__filter_group = None
 
-    def get_viessmann_data(self, max_values: int = None):
+    def get_viessmann_data(self, max_values: int = None, deadline: float = None):
         """Requests and returns the actual data from vcontrold.
 
         This method uses :py:meth:`groups` to filter the executed commands, if defined. Otherwise,
@@ -648,6 +1393,12 @@ class vcontrold:
         of commands, but don't want to wait until all commands are executed, because you only need an example
         of the returned data. I've used this extensively while sanitizing the returned data.
 
+        The argument ``deadline`` limits the whole process to a time budget in seconds. Based on the ``priority``
+        of each command in ``vcontrold_config.yml`` (defaults to ``1``, higher values are more important) and the
+        latencies measured during previous executions, the commands with the highest priority, which fit into the
+        budget, are executed first. Commands, which don't fit into the budget, are skipped and listed in the meta
+        data as ``skipped``.
+
         Note:
             Please be informed, that vcontrold takes some time, until an executed command returns any data.
             Each command will approximately need 2.5 seconds to complete. If all available commands are
@@ -656,22 +1407,147 @@ class vcontrold:
 
         Args:
             max_values (int): Max number of executed commands.
+            deadline (float): Time budget in seconds for all executed commands. Defaults to ``None`` (no limit).
 
         Returns:
             mixed: Returns data based on self.output_format. Defaults to JSON.
 
+        .. versionchanged:: 2.1.0
+            Added the argument ``deadline``.
+            Returns only the results of this call, instead of all results collected by the instance.
+            Applies changes of the configuration file before the sweep, see :py:attr:`auto_reload_config`.
+        """
+        if self.__auto_reload_config is True:
+            self.reload_config()
+        catalog = self._catalog
+        self.__last_results = self._sweep(catalog, self._filter_mask(catalog), max_values, deadline)
+
+        # Return data
+        if self.__output_format == "json":
+            return self.__last_results.to_json(self.__exclude_timers)
+        elif self.__output_format == "dict":
+            return self.__last_results.as_dict(self.__exclude_timers)
+        elif self.__output_format == "results":
+            return self.__last_results
+        elif self.__output_format == "csv":
+            csv_keys = ['Command']
+            csv_values = []
+            if self.__csv_single_quotes is True:
+                quote = "'"
+            else:
+                quote = '"'
+
+            for command, command_value in self.__last_results.as_dict(self.__exclude_timers)['data'].items():
+                # csv_data_string = quote + str(command) + quote + self.csv_delimiter
+                csv_data_values = [str(command)]
+                for cmd_key, cmd_value in command_value.items():
+                    if cmd_key not in csv_keys:
+                        csv_keys.append(cmd_key)
+                    csv_data_values.append(str(cmd_value))
+
+                csv_values.append(quote + (quote + self.__csv_delimiter + quote).join(csv_data_values) + quote)
+
+            csv_data = quote + (quote + self.__csv_delimiter + quote).join(csv_keys) + quote + self.__csv_linebreak
+            csv_data += self.__csv_linebreak.join(csv_values)
+            return csv_data
+
+    def query(self, expressions: list, deadline: float = None) -> dict:
+        """Reads the commands of multiple group expressions in a single sweep.
+
+        Each expression combines groups with ``|`` (union), ``&`` (intersection) and ``!`` (all commands except),
+        e.g. ``temperature & mixer`` or ``* & !error & !timer``. The commands of all expressions are read once,
+        also if they match multiple expressions, and each expression gets a separate view of the results.
+
+        Example:
+            >>> views = vcd.query(['temperature & mixer', 'pumps | burner'])
+            >>> views['pumps | burner'].to_json()
+
+        Args:
+            expressions (list): The group expressions.
+            deadline (float): Time budget in seconds for the whole sweep, see :py:meth:`get_viessmann_data`.
+
+        Returns:
+            dict: The expressions as keys, with a :py:class:`vcdResultSet` of the matching commands as value.
+
+        Raises:
+            ValueError: If an expression is invalid or refers to an unknown group.
+
+        .. versionadded:: 2.1.0
+        """
+        if self.__auto_reload_config is True:
+            self.reload_config()
+        catalog = self._catalog
+        masks = {expression: catalog.mask(expression) for expression in expressions}
+        mask = 0
+        for expression_mask in masks.values():
+            mask |= expression_mask
+
+        self.__last_results = self._sweep(catalog, mask, None, deadline)
+
+        index = catalog.positions
+        views = {}
+        for expression, expression_mask in masks.items():
+            results = [result for result in self.__last_results if expression_mask >> index[result.command] & 1]
+            skipped = [command for command in self.__last_results.meta.get('skipped', [])
+                       if expression_mask >> index[command] & 1]
+            meta = dict(self.__last_results.meta, expression=expression)
+            if 'skipped' in meta:
+                meta['skipped'] = skipped
+            views[expression] = vcdResultSet(results, self.__last_results.duration, self.__last_results.timestamp, meta)
+
+        return views
+
+    def _filter_mask(self, catalog: vcdCatalog) -> int:
+        """Returns the bitset of the commands of the catalog, which match the group filter of :py:attr:`groups`."""
+        if self.__filter_group is None:
+            return catalog.all_mask
+
+        mask = 0
+        for expression in self.__filter_group:
+            try:
+                mask |= catalog.mask(expression)
+            except ValueError:
+                # The group doesn't exist for the identified device
+                continue
+
+        return mask
+
+    def _sweep(self, catalog: vcdCatalog, mask: int, max_values: int = None, deadline: float = None) -> vcdResultSet:
+        """Executes the commands of a bitset over the command index of the catalog.
+
+        The catalog is used for the whole sweep, also if the configuration is reloaded meanwhile.
+
+        Args:
+            catalog (vcdCatalog): The catalog, whose commands are executed.
+            mask (int): Bitset of the commands, see :py:meth:`vcdCatalog.mask`.
+            max_values (int): Max number of executed commands.
+            deadline (float): Time budget in seconds for all executed commands.
+
+        Returns:
+            vcdResultSet: The results of the sweep.
         """
         time_start = time.time()
 
         # Get the total number of executed commands
         commands_to_be_executed = []
-        for command, params in self.config["vcontrold_commands"]['get'].items():
-            if params["status"] == "enabled":
-                if self.__filter_group is not None:
-                    if not any(group in self.__filter_group for group in params['groups']):
-                        continue
+        for command in catalog.select(mask):
+            if catalog[command].status == "enabled":
+                if self._capabilities.supported(command) is False:
+                    continue
+                if self.circuit_breaker.allow(command) is False:
+                    continue
                 commands_to_be_executed.append(command)
 
+        if self.__warm_start is True:
+            self.__warm_start = False
+            commands_to_be_executed.sort(key=lambda command: catalog[command].priority, reverse=True)
+
+        skipped_commands = []
+        if deadline is not None:
+            commands_to_be_executed, skipped_commands = self._plan_sweep(commands_to_be_executed, deadline, catalog)
+            if self.__log_info is True and len(skipped_commands) > 0:
+                print(f"Skipping {len(skipped_commands)} commands, which don't fit into the deadline of {deadline} seconds.")
+
         num_commands = len(commands_to_be_executed)
         if max_values is not None:
             if max_values < num_commands:
@@ -679,6 +1555,7 @@ class vcontrold:
                     if self.__log_info is True:
                         print(f"Limited the maximum returned values to {max_values}.")
                     num_commands = max_values
+                    skipped_commands.extend(commands_to_be_executed[num_commands:])
                 else:
                     if self.__log_info is True:
                         print(f"Option 'max_values' is 0. This is interpreted as 'any'. Ignoring 'max_values'.")
@@ -686,9 +1563,29 @@ class vcontrold:
                 if self.__log_info is True:
                     print(f"Option 'max_values' ({max_values}) is greater than the number of commands to be executed ({commands_to_be_executed}). Ignoring 'max_values'.")
 
+        if self.__stalled is True and self.__reconnect_on_stall is True:
+            if self.__log_info is True:
+                print("Re-establishing the connection, as the previous sweep stalled.")
+            try:
+                self._reconnect()
+            except OSError as e:
+                # The connection stays stale and is retried by the first command
+                if self.__log_info is True:
+                    print(f"Failed to re-establish the connection: {e}")
+        self.__stalled = False
+        if self.watchdog is not None:
+            self.watchdog.reset()
+        stall_reason = None
+
         loop_count = 1
+        results = []
+
+        for index, command in enumerate(commands_to_be_executed):
+            if deadline is not None and time.time() - time_start + self._expected_latency(command) > deadline:
+                # Measured latencies exceeded the planned ones, so the remaining commands don't fit anymore
+                skipped_commands.extend(commands_to_be_executed[index:num_commands])
+                break
 
-        for command in commands_to_be_executed:
             if self.__log_info is True:
                 # Write stdout
                 sys.stdout.write(f"\rExecuting command {loop_count:02d} of {num_commands:02d} ({command:s})...")
@@ -696,7 +1593,19 @@ class vcontrold:
                 sys.stdout.flush()
 
             # Execute the command
-            self._read(command=command)
+            expected_latency = self._expected_latency(command)
+            result = self._read(command=command, lane=BACKGROUND, catalog=catalog)
+            if result is not None:
+                results.append(result)
+
+                if self.watchdog is not None:
+                    stall_reason = self.watchdog.observe(result, expected_latency)
+                    if stall_reason is not None:
+                        if self.__log_info is True:
+                            print(f"\nSweep stalled ({stall_reason}), skipping the remaining commands.")
+                        self.__stalled = True
+                        skipped_commands.extend(commands_to_be_executed[index + 1:num_commands])
+                        break
 
             if loop_count >= num_commands:
                 break
@@ -707,34 +1616,27 @@ class vcontrold:
             print("-------------------------------")
 
         time_end = time.time()
-        duration = round(time_end - time_start, 3)
-        if self.exclude_timers is not True:
-            self.viessmann_data['meta'].update({'execution_time': f'{duration} seconds'})
-        self.viessmann_data['meta'].update({'num_items': len(self.viessmann_data['data'])})
-
-        # Return data
-        if self.__output_format == "json":
-            return json.dumps(self.viessmann_data, indent=4)
-        elif self.__output_format == "dict":
-            return self.viessmann_data
-        elif self.__output_format == "csv":
-            csv_keys = ['Command']
-            csv_values = []
-            if self.__csv_single_quotes is True:
-                quote = "'"
-            else:
-                quote = '"'
-
-            for command, command_value in self.viessmann_data['data'].items():
-                # csv_data_string = quote + str(command) + quote + self.csv_delimiter
-                csv_data_values = [str(command)]
-                for cmd_key, cmd_value in command_value.items():
-                    if cmd_key not in csv_keys:
-                        csv_keys.append(cmd_key)
-                    csv_data_values.append(cmd_value)
-
-                csv_values.append(quote + (quote + self.__csv_delimiter + quote).join(csv_data_values) + quote)
-
-            csv_data = quote + (quote + self.__csv_delimiter + quote).join(csv_keys) + quote + self.__csv_linebreak
-            csv_data += self.__csv_linebreak.join(csv_values)
-            return csv_data
+        meta = {}
+        if stall_reason is not None:
+            meta.update({'status': 'stalled', 'stall_reason': stall_reason})
+        if deadline is not None or stall_reason is not None:
+            # Keep the configured order of the skipped commands
+            skipped_commands.sort(key=catalog.positions.__getitem__)
+            meta.update({'skipped': skipped_commands})
+        with self._data_lock:
+            derived = self.metrics.values()
+            if self.__include_statistics is True:
+                meta['statistics'] = {
+                    result.command: self.__statistics[result.command].as_dict()
+                    for result in results if result.command in self.__statistics
+                }
+        result_set = vcdResultSet(results, time_end - time_start, time_start, meta, derived)
+        with self._data_lock:
+            self.__history.append(result_set)
+        self._notify_subscribers(result_set)
+
+        if self.__snapshot is not None:
+            if self.__snapshot.saved_at is None or time_end - self.__snapshot.saved_at >= self.__snapshot_interval:
+                self.save_snapshot()
+
+        return result_set